@@ -1,20 +1,16 @@
 import logging
 
 
-# Class that can be inherited to provide a .l logger method.
+# Class that can be inherited to provide a .l logger attribute.
 class SimpleLoggableBase(object):
-    @property
-    def l(self) -> logging.Logger:
+    # No instance state here, so subclasses are free to use __slots__.
+    __slots__ = ()
 
-        # Get RootLogger
-        rootlogger = logging.getLogger()
+    # This class' logger, a child of the RootLogger.
+    l: logging.Logger = logging.getLogger().getChild("SimpleLoggableBase")
 
-        # Try to get this class' logger
-        loggerobj = getattr(self, "__logger__", None)
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
 
-        if not loggerobj:
-            # Create this class logger if it doesn't exist.
-            self.__logger__ = rootlogger.getChild(self.__class__.__name__)
-
-        # return the logger
-        return self.__logger__
+        # Create the subclass' logger once, at class creation time.
+        cls.l = logging.getLogger().getChild(cls.__name__)
@@ -1,3 +1,4 @@
+import logging
 from dataclasses import dataclass
 from typing import List, Dict, Callable, Any, Type
 
@@ -9,6 +10,8 @@ import graphene
 from graphene import ID, Argument
 from graphene_sqlalchemy.converter import convert_sqlalchemy_composite
 from graphene_sqlalchemy.registry import get_global_registry
+from graphql import parse, validate, execute
+from graphql.execution import ExecutionResult
 
 from sqlalchemy_graphql_schemagen.baseclasses.logging import SimpleLoggableBase
 
@@ -31,20 +34,67 @@ from sqlalchemy_graphql_schemagen.graphql.schemagen.utilities import (
     create_delete_obj_mutation_object,
     create_update_obj_mutation_object,
     get_all_sa_classless_tables,
-    is_association_table)
+    is_association_table,
+    SAModelMeta,
+    LoaderOptionsFuncType)
+
+
+################################
+# Default SQLAlchemy Composite Type Converter (STRING)
+################################
+def default_sa_composite_class_converter(composite, _registry):
+    return graphene.String(description=composite.doc)
+
+
+################################
+# Pagination Arguments - identical for every query field, so they're shared.
+################################
+PAGINATION_PAGE_ARGUMENT = Argument(
+    graphene.Int, default_value=1, description="(Pagination) Page Number"
+)
+PAGINATION_PERPAGE_ARGUMENT = Argument(
+    graphene.Int,
+    default_value=50,
+    description="(Pagination) Results Per Page",
+)
 
 
 class SQLAlchemyGraphQLSchemaGenerator(SimpleLoggableBase):
+    __slots__ = (
+        "ignore_models",
+        "skip_assoc_create_delete",
+        "extra_mutation_objects",
+        "extra_query_objects",
+        "extra_object_meta_args",
+        "api_name",
+        "declarative_base",
+        "_sa_model_classes",
+        "_sa_model_meta",
+        "sa_connection_string",
+        "op_hooks",
+        "loader_options",
+        "autocommit",
+        "sa_composite_converters",
+        "_gql_query_type_cache",
+        "_gql_mutation_type_cache",
+    )
+
     def __init__(self, api_name: str, declarative_base: DeclarativeMeta, sa_connection_string: str,
                  ignore_models: List = None, op_hooks: HookDictType = None, sa_composite_converters: Dict[Any, Any] = None,
                  extra_query_objects: Dict[str, graphene.ObjectType] = None,
                  extra_mutation_objects: Dict[str, graphene.ObjectType] = None,
-                 extra_object_meta_args: Dict[DeclarativeMeta, Dict[str, object]] = None):
+                 extra_object_meta_args: Dict[DeclarativeMeta, Dict[str, object]] = None,
+                 skip_assoc_create_delete: bool = False,
+                 loader_options: LoaderOptionsFuncType = None,
+                 autocommit: bool = True):
 
         # List of Models to ignore during dynamic SQLAlchemy-->GraphQL generation
 
         self.ignore_models = ignore_models if ignore_models else []
 
+        # Many-to-many association tables never get an UPDATE mutation, optionally skip CREATE/DELETE too.
+        self.skip_assoc_create_delete = skip_assoc_create_delete
+
         # Extra (query|mutation|object meta) objects
         self.extra_mutation_objects = extra_mutation_objects if extra_mutation_objects else {}
         self.extra_query_objects = extra_query_objects if extra_query_objects else {}
@@ -53,25 +103,55 @@ class SQLAlchemyGraphQLSchemaGenerator(SimpleLoggableBase):
         self.api_name = api_name
         self.declarative_base = declarative_base
 
+        # Snapshot of all SQLAlchemy Model Classes (and their inspected metadata), shared by the query and mutation passes.
+        self._sa_model_classes = ()
+        self._sa_model_meta: Dict[DeclarativeMeta, SAModelMeta] = {}
+        self.refresh_models()
+
         # save the connection string
         self.sa_connection_string = sa_connection_string
 
         # save the hooks
         self.op_hooks = op_hooks or {}
 
+        # save the get_all queries' loader options (avoids N+1 lazy loads on nested relationship fields)
+        self.loader_options = loader_options
+
+        # mutations commit by themselves, or (autocommit=False) only flush, and the commit is left to the caller
+        # (see HookOperation.TRANSACTION / commit_request_db_sessions)
+        self.autocommit = autocommit
+
         # Save and register SQLAlchemy Composite Types
         self.sa_composite_converters = sa_composite_converters or {}
         self.register_composites()
 
+        # Per-model cache of the generated GraphQL objects, so regenerating the schema reuses them.
+        #   query: {model: (resolve_func, graphql_model_class, graphene.List field)}
+        #   mutation: {model: (update_obj_class or None, create_obj_class, delete_obj_class, delete_list_obj_class)}
+        self._gql_query_type_cache = {}
+        self._gql_mutation_type_cache = {}
+
+    def refresh_models(self):
+        """Re-read the Model Classes from the declarative base (ex.: models declared after __init__).
+        get_graphene_schema() calls it first thing, so every schema sees the models declared so far."""
+        self._sa_model_classes = tuple(get_all_sa_model_classes(self.declarative_base))
+
+        # Models seen by a previous snapshot keep their inspected metadata.
+        sa_model_meta = self._sa_model_meta
+        self._sa_model_meta = {
+            sa_model_class: sa_model_meta.get(sa_model_class) or SAModelMeta.from_sa_model_class(sa_model_class)
+            for sa_model_class in self._sa_model_classes
+        }
+
     def register_composites(self):
+        # Nothing to register.
+        if not self.sa_composite_converters:
+            return
+
         for (
             CompositeClass,
             CompositeConverterFunc,
         ) in self.sa_composite_converters.items():
-            # Generate a Default Converter (STRING)
-            def default_sa_composite_class_converter(composite, _registry):
-                return graphene.String(description=composite.doc)
-
             # Register converter using the provided function or the default one will be provided.
             convert_sqlalchemy_composite.register(CompositeClass)(
                 CompositeConverterFunc
@@ -86,8 +166,11 @@ class SQLAlchemyGraphQLSchemaGenerator(SimpleLoggableBase):
         self, generate_query=True, generate_mutation=True, **graphene_schema_args
     ) -> graphene.Schema:
 
-        schema_params = {"query": None, "mutation": None}
-        schema_params.update(graphene_schema_args)
+        # Pick up the models declared since the last snapshot (the query and mutation passes share it).
+        self.refresh_models()
+
+        # Only pass query/mutation to graphene.Schema when they were actually generated.
+        schema_params = dict(graphene_schema_args)
 
         if generate_query:
             self.l.debug("Generating Query schema...")
@@ -100,41 +183,66 @@ class SQLAlchemyGraphQLSchemaGenerator(SimpleLoggableBase):
         self.l.debug("Assembling graphene.Schema from schema_params")
 
         schema = graphene.Schema(**schema_params)
-        self.l.debug(
-            f"""
+
+        # str(schema) serializes the whole schema, only do it if it's going to be logged.
+        if self.l.isEnabledFor(logging.DEBUG):
+            self.l.debug(
+                """
 ---GRAPHQL SCHEMA START---
-{str(schema)}
+%s
 ---GRAPHQL SCHEMA END---
-"""
-        )
+""",
+                str(schema),
+            )
+
+        return schema
+
+    ##################################################
+    # Pre-compiled Query Execution
+    ##################################################
+    @staticmethod
+    def get_compiled_executor(schema: graphene.Schema, request_string: str) -> Callable[..., ExecutionResult]:
+        """ Parses and validates `request_string` against `schema` once, and returns a function
+        that executes it with: (root_value=None, context_value=None, variable_values=None, operation_name=None).
 
-        return graphene.Schema(**schema_params)
+        Meant for documents that are executed over and over (ex.: the same query from a frontend), so
+        they skip the parse+validate steps that schema.execute() does on every call.
+        """
+        document_ast = parse(request_string)
+
+        validation_errors = validate(schema, document_ast)
+        if validation_errors:
+            def invalid_document_executor(*_args, **_kwargs) -> ExecutionResult:
+                return ExecutionResult(errors=validation_errors, invalid=True)
+
+            return invalid_document_executor
+
+        def compiled_document_executor(root_value=None, context_value=None, variable_values=None,
+                                       operation_name=None, **execute_options) -> ExecutionResult:
+            return execute(schema, document_ast, root_value=root_value, context_value=context_value,
+                           variable_values=variable_values, operation_name=operation_name, **execute_options)
+
+        return compiled_document_executor
 
     ##################################################
     # Generate QUERY Schema
     ##################################################
     def generate_query_schema(self) -> type:
 
-        # List of all Model Classes from SQLAlchemy
-        sa_model_classes = get_all_sa_model_classes(self.declarative_base)
-
         # Root Query Class Attribute Dict
         root_query_class_dict = {"__doc__": f'Root Query Class for "{self.api_name}"'}
 
-        # List of All Object to Generate Dynamic Methods
-        all_objects = sa_model_classes
-
         # Iterate through all SQLAlchemy's classes, building GraphQL Objects
-        for sa_queryable_object in all_objects:
+        for sa_queryable_object in self._sa_model_classes:
 
             self.generate_query_schema_sa_class(
                 root_query_class_dict, sa_queryable_object
             )
 
-        # Iterate through extra_query_objects
-        for obj_name, graphene_obj in self.extra_query_objects.items():
-            self.l.debug(f"Attaching Extra_Query_Object {obj_name}...")
-            root_query_class_dict[obj_name] = graphene_obj
+        # Attach extra_query_objects, all at once
+        if self.extra_query_objects:
+            self.l.debug("Attaching Extra_Query_Objects %s...", list(self.extra_query_objects))
+            root_query_class_dict.update(self.extra_query_objects)
 
         # Build Main Class and attach objects built in the last step.
         root_query_class = type(
@@ -144,23 +252,9 @@ class SQLAlchemyGraphQLSchemaGenerator(SimpleLoggableBase):
         # Return the newly built class.
         return root_query_class
 
-    def generate_query_schema_sa_table(
-        self, root_query_class_dict, sa_queryable_object: Table
-    ):
-        sa_table_name = str(sa_queryable_object.name)
-        self.l.debug(f"[Query] SQLAlchemy Classless Table --> {sa_table_name}")
-
-        # Get resolve_<object> Function
-        resolve_func = make_resolve_func_maker(
-            sa_queryable_object, self.get_session_func, self.op_hooks
-        )
-
-        # Attach resolve func to class.
-        root_query_class_dict[resolve_func.__name__] = resolve_func
-        # Build {Class} = graphene.List({Class})
-        graphql_model_class = gql_query_build_sa_obj_type(sa_queryable_object)
-        # Attach {Class} = graphene.List({Class})
-        root_query_class_dict[f"{sa_table_name}"] = graphene.List(
+    def make_query_field(self, sa_queryable_object, graphql_model_class) -> graphene.List:
+        """Build the {Class} = graphene.List({Class}) query field, with its filters/order_by/pagination arguments"""
+        return graphene.List(
             graphql_model_class,
             description=make_gql_object_description_from_sa_model_class(
                 sa_queryable_object
@@ -171,61 +265,74 @@ class SQLAlchemyGraphQLSchemaGenerator(SimpleLoggableBase):
             order_by=create_gql_get_query_order_by_filter_input_object_type_from_sa_model(
                 sa_queryable_object
             ),
-            page=Argument(
-                graphene.Int, default_value=1, description="(Pagination) Page Number"
-            ),
-            perpage=Argument(
-                graphene.Int,
-                default_value=50,
-                description="(Pagination) Results Per Page",
-            ),
+            page=PAGINATION_PAGE_ARGUMENT,
+            perpage=PAGINATION_PERPAGE_ARGUMENT,
         )
 
-    def generate_query_schema_sa_class(
-        self, root_query_class_dict, sa_queryable_object
+    @staticmethod
+    def attach_query_field(root_query_class_dict, field_name: str, resolve_func, query_field: graphene.List):
+        # Attach resolve func to class.
+        root_query_class_dict[resolve_func.__name__] = resolve_func
+
+        # Attach {Class} = graphene.List({Class})
+        root_query_class_dict[field_name] = query_field
+
+    def generate_query_schema_sa_table(
+        self, root_query_class_dict, sa_queryable_object: Table
     ):
-        # Get the actual table name for this entity.
-        sa_table_name = sa_queryable_object.__tablename__
-        self.l.debug(f"[Query] SQLAlchemy Class --> {sa_queryable_object.__name__}")
+        sa_table_name = str(sa_queryable_object.name)
+        self.l.debug("[Query] SQLAlchemy Classless Table --> %s", sa_table_name)
+
         # Get resolve_<object> Function
         resolve_func = make_resolve_func_maker(
-            sa_queryable_object, self.sa_connection_string, self.op_hooks
+            sa_queryable_object, self.sa_connection_string, self.op_hooks, self.loader_options
         )
 
-        extra_metaclass_properties = {}
-        if sa_queryable_object in self.extra_object_meta_args:
-            extra_metaclass_properties = self.extra_object_meta_args[sa_queryable_object]
-
         # Build {Class} = graphene.ObjectType({Class})
-        graphql_model_class = gql_query_build_sa_obj_type(sa_queryable_object,
-                                                          extra_metaclass_properties=extra_metaclass_properties)
+        graphql_model_class = gql_query_build_sa_obj_type(sa_queryable_object)
 
-        if sa_queryable_object not in self.ignore_models:
-            # Attach resolve func to class.
-            root_query_class_dict[resolve_func.__name__] = resolve_func
-
-            # Attach {Class} = graphene.List({Class})
-            root_query_class_dict[f"{sa_table_name}"] = graphene.List(
-                graphql_model_class,
-                description=make_gql_object_description_from_sa_model_class(
-                    sa_queryable_object
-                ),
-                filters=create_gql_get_query_filter_input_object_type_from_sa_model(
-                    sa_queryable_object
-                ),
-                order_by=create_gql_get_query_order_by_filter_input_object_type_from_sa_model(
-                    sa_queryable_object
-                ),
-                page=Argument(
-                    graphene.Int, default_value=1, description="(Pagination) Page Number"
-                ),
-                perpage=Argument(
-                    graphene.Int,
-                    default_value=50,
-                    description="(Pagination) Results Per Page",
-                ),
+        self.attach_query_field(
+            root_query_class_dict,
+            sa_table_name,
+            resolve_func,
+            self.make_query_field(sa_queryable_object, graphql_model_class),
+        )
+
+    def generate_query_schema_sa_class(
+        self, root_query_class_dict, sa_queryable_object
+    ):
+        sa_model_meta = self._sa_model_meta[sa_queryable_object]
+
+        # Get the actual table name for this entity.
+        sa_table_name = sa_model_meta.tablename
+        self.l.debug("[Query] SQLAlchemy Class --> %s", sa_model_meta.name)
+
+        cached_query_objects = self._gql_query_type_cache.get(sa_queryable_object)
+        if cached_query_objects is None:
+            # Get resolve_<object> Function
+            resolve_func = make_resolve_func_maker(
+                sa_queryable_object, self.sa_connection_string, self.op_hooks, self.loader_options
             )
 
+            extra_metaclass_properties = {}
+            if sa_queryable_object in self.extra_object_meta_args:
+                extra_metaclass_properties = self.extra_object_meta_args[sa_queryable_object]
+
+            # Build {Class} = graphene.ObjectType({Class})
+            graphql_model_class = gql_query_build_sa_obj_type(sa_queryable_object,
+                                                              extra_metaclass_properties=extra_metaclass_properties)
+
+            # Build {Class} = graphene.List({Class})
+            query_field = self.make_query_field(sa_queryable_object, graphql_model_class)
+
+            cached_query_objects = (resolve_func, graphql_model_class, query_field)
+            self._gql_query_type_cache[sa_queryable_object] = cached_query_objects
+
+        resolve_func, graphql_model_class, query_field = cached_query_objects
+
+        if sa_queryable_object not in self.ignore_models:
+            self.attach_query_field(root_query_class_dict, sa_table_name, resolve_func, query_field)
+
 
     ##################################################
     # Generate Mutation Schema
@@ -235,56 +342,89 @@ class SQLAlchemyGraphQLSchemaGenerator(SimpleLoggableBase):
         root_mutation_class_dict = {
             "__doc__": f'Root Mutation Class for "{self.api_name}"'
         }
-        for sa_model_class in get_all_sa_model_classes(self.declarative_base):
+        for sa_model_class, sa_model_meta in self._sa_model_meta.items():
             if sa_model_class in self.ignore_models:
                 continue
 
-            class_name = sa_model_class.__name__
-            self.l.debug(f"[Mutation] SQLAlchemy Class --> {class_name}")
-
-            ################################
-            # UPDATE - skip on many-to-many association table
-            ################################
-            if not is_association_table(sa_model_class):
-                update_obj_class = create_update_obj_mutation_object(
-                    sa_model_class, self.sa_connection_string, self.op_hooks
+            class_name = sa_model_meta.name
+            lower_class_name = class_name.lower()
+            self.l.debug("[Mutation] SQLAlchemy Class --> %s", class_name)
+
+            # Many-to-many association tables: inspected once, drives all three operations below.
+            is_assoc = sa_model_meta.is_association
+            skip_assoc_create_delete = is_assoc and self.skip_assoc_create_delete
+
+            cached_mutation_objects = self._gql_mutation_type_cache.get(sa_model_class)
+            if cached_mutation_objects is None:
+                ################################
+                # UPDATE - skip on many-to-many association table
+                ################################
+                update_obj_class = None
+                if not is_assoc:
+                    update_obj_class = create_update_obj_mutation_object(
+                        sa_model_class, self.sa_connection_string, self.op_hooks, self.autocommit
+                    )
+
+                ################################
+                # CREATE / DELETE - skip on many-to-many association table, if asked to
+                ################################
+                create_obj_class = None
+                delete_obj_class = None
+                delete_list_obj_class = None
+                if not skip_assoc_create_delete:
+                    create_obj_class = create_create_obj_mutation_object(
+                        sa_model_class, self.sa_connection_string, self.op_hooks, self.autocommit
+                    )
+
+                    delete_obj_class = create_delete_obj_mutation_object(
+                        sa_model_class, self.sa_connection_string, self.op_hooks, self.autocommit
+                    )
+
+                    # single primary key models can also be deleted by a list of pks, in one statement
+                    if len(sa_model_meta.mapper.primary_key) == 1:
+                        delete_list_obj_class = create_delete_obj_mutation_object(
+                            sa_model_class, self.sa_connection_string, self.op_hooks, self.autocommit,
+                            by_pk_list=True
+                        )
+
+                cached_mutation_objects = (
+                    update_obj_class, create_obj_class, delete_obj_class, delete_list_obj_class
                 )
+                self._gql_mutation_type_cache[sa_model_class] = cached_mutation_objects
 
-                root_mutation_class_dict[
-                    f"update_{class_name.lower()}"
-                ] = update_obj_class.Field()
-            else:
+            update_obj_class, create_obj_class, delete_obj_class, delete_list_obj_class = cached_mutation_objects
+
+            if is_assoc:
                 self.l.debug(
-                    f'Skipping "UPDATE" on class "{class_name}" since it is a many-to-many assoc table...'
+                    'Skipping "UPDATE"%s on class "%s" since it is a many-to-many assoc table...',
+                    '/"CREATE"/"DELETE"' if skip_assoc_create_delete else "",
+                    class_name,
                 )
 
-            ################################
-            # CREATE
-            ################################
-            create_obj_class = create_create_obj_mutation_object(
-                sa_model_class, self.sa_connection_string, self.op_hooks
-            )
-
-            root_mutation_class_dict[
-                f"create_{class_name.lower()}"
-            ] = create_obj_class.Field()
+            if update_obj_class is not None:
+                root_mutation_class_dict[
+                    f"update_{lower_class_name}"
+                ] = update_obj_class.Field()
 
-            ################################
-            # DELETE
-            ################################
-            delete_obj_class = create_delete_obj_mutation_object(
-                sa_model_class, self.sa_connection_string, self.op_hooks
-            )
+            if create_obj_class is not None:
+                root_mutation_class_dict[
+                    f"create_{lower_class_name}"
+                ] = create_obj_class.Field()
 
-            root_mutation_class_dict[
-                f"delete_{class_name.lower()}"
-            ] = delete_obj_class.Field()
+            if delete_obj_class is not None:
+                root_mutation_class_dict[
+                    f"delete_{lower_class_name}"
+                ] = delete_obj_class.Field()
 
+            if delete_list_obj_class is not None:
+                root_mutation_class_dict[
+                    f"delete_{lower_class_name}_list"
+                ] = delete_list_obj_class.Field()
 
-        # Iterate through extra_mutation_objects
-        for obj_name, graphene_obj in self.extra_mutation_objects.items():
-            self.l.debug(f"Attaching Extra_Mutation_Object {obj_name}...")
-            root_mutation_class_dict[obj_name] = graphene_obj
+        # Attach extra_mutation_objects, all at once
+        if self.extra_mutation_objects:
+            self.l.debug("Attaching Extra_Mutation_Objects %s...", list(self.extra_mutation_objects))
+            root_mutation_class_dict.update(self.extra_mutation_objects)
 
         root_mutation_class = type(
             f"Mutation_{self.api_name}",
@@ -1,3 +1,8 @@
+import os
+import sys
+import threading
+from typing import Dict
+
 import graphene
 from graphene.utils.subclass_with_meta import SubclassWithMeta_Meta
 
@@ -43,29 +48,95 @@ class FilterOperation(graphene.Enum):
 # <type>FilterOp GraphQL Object
 ################################
 
-__SCHEMAGEN_filter_op_type_class_registry = {}
+# The "op" field is the same for every <typed>FilterOperation, so all of them share this one instance.
+# (created at import time, so it keeps sorting first among each FilterOp's fields)
+_OP_FIELD = graphene.Field(FilterOperation, required=True)
 
 
-def create_or_get_graphql_filter_op_type_class(graphql_type: SubclassWithMeta_Meta):
-    # Global repository of <typed>FilterOperations
-    global __SCHEMAGEN_filter_op_type_class_registry
+# Common base of every <typed>FilterOperation: "op" is inherited, each subclass only brings its typed fields.
+# (abstract, so graphene never turns the base itself into a schema type)
+class _FilterOpBase(graphene.InputObjectType):
+    class Meta:
+        abstract = True
+
+    op = _OP_FIELD
+
+
+# Global repository of <typed>FilterOperations, by graphql type class (classes hash by identity).
+__SCHEMAGEN_filter_op_type_class_registry: Dict[SubclassWithMeta_Meta, type] = {}
 
-    # The GraphQL type name we are going to create a filter op type to.
-    graphql_type_name = graphql_type.__name__
+# Guards the registry's miss path (building + storing a new FilterOp class).
+_filter_op_type_class_registry_lock = threading.Lock()
+
+
+def create_or_get_graphql_filter_op_type_class(graphql_type: SubclassWithMeta_Meta):
+    # One globals lookup, the registry is only mutated (never rebound), so no `global` statement needed.
+    filter_op_type_class_registry = __SCHEMAGEN_filter_op_type_class_registry
+
+    # Hit path: a single lookup, the registry is almost always warm.
+    try:
+        return filter_op_type_class_registry[graphql_type]
+    except KeyError:
+        pass
+
+    # Miss path: build under the lock, re-checking first, so concurrent schema builds (ex.: threaded servers)
+    # never end up with two different FilterOp classes for the same type.
+    with _filter_op_type_class_registry_lock:
+        try:
+            return filter_op_type_class_registry[graphql_type]
+        except KeyError:
+            pass
 
-    if graphql_type_name not in __SCHEMAGEN_filter_op_type_class_registry:
         # Create
-        fop_class_name = f"{graphql_type_name}FilterOp"
+        # (a plain type() call: graphene's metaclass does the same work for an exec()'d class body, and
+        # the registry makes this run once per graphql type.)
+        # (interned: graphene's type map and schema lookups key on this name)
+        fop_class_name = sys.intern(f"{graphql_type.__name__}FilterOp")
         fop = type(
             fop_class_name,
-            (graphene.InputObjectType,),
+            (_FilterOpBase,),
             {
-                "op": graphene.Field(FilterOperation, required=True),
-                "v": graphene.Field(graphql_type, required=False, default_value=None),
-                "vl": graphene.Field(graphene.List(graphql_type), required=False, default_value=None)
+                "v": graphene.Field(graphql_type, required=False),
+                "vl": graphene.Field(graphene.List(graphql_type), required=False)
             },
         )
 
-        __SCHEMAGEN_filter_op_type_class_registry[graphql_type_name] = fop
+        filter_op_type_class_registry[graphql_type] = fop
+
+    return fop
 
-    return __SCHEMAGEN_filter_op_type_class_registry[graphql_type_name]
+
+################################
+# FilterOp[SomeGrapheneType] --> its <typed>FilterOperation, same as create_or_get_graphql_filter_op_type_class()
+################################
+class FilterOp(object):
+    __slots__ = ()
+
+    # staticmethod: the subscript goes straight to the factory, no extra classmethod frame.
+    __class_getitem__ = staticmethod(create_or_get_graphql_filter_op_type_class)
+
+
+################################
+# Pre-register the FilterOps of graphene's scalar types (the ones SQLAlchemy columns convert to),
+# so the first schema build finds them already built.
+#
+# SCHEMAGEN_PREREGISTER_SCALAR_FILTER_OPS=0 in the environment turns it off (ex.: tests of the miss path),
+# they're then built by the first schema that needs them.
+################################
+SCALAR_FILTER_OP_GRAPHQL_TYPES = (
+    graphene.String,
+    graphene.Int,
+    graphene.Float,
+    graphene.Boolean,
+    graphene.ID,
+    graphene.Date,
+    graphene.Time,
+    graphene.DateTime,
+    graphene.Decimal,
+)
+
+PREREGISTER_SCALAR_FILTER_OPS = os.environ.get("SCHEMAGEN_PREREGISTER_SCALAR_FILTER_OPS", "1") != "0"
+
+SCALAR_FILTER_OP_TYPE_CLASSES = tuple(
+    create_or_get_graphql_filter_op_type_class(scalar_type) for scalar_type in SCALAR_FILTER_OP_GRAPHQL_TYPES
+) if PREREGISTER_SCALAR_FILTER_OPS else ()
@@ -1,5 +1,6 @@
+import inspect
 from enum import Enum
-from typing import Dict, Type, Any
+from typing import Dict, Type, Any, Callable
 
 from abc import ABC, abstractmethod
 
@@ -11,6 +12,8 @@ class HookOperation(Enum):
     READ = "read"
     UPDATE = "update"
     DELETE = "delete"
+    # Wraps every generated mutation (create/update/delete), around the operation's own hook
+    TRANSACTION = "transaction"
 
 
 class PreHookResult(Enum):
@@ -24,6 +27,8 @@ class SchemaGenHookException(Exception):
 
 # noinspection PyMethodParameters
 class SchemaGenHooksBase(ABC):
+    __slots__ = ("func_to_be_decorated",)
+
     @staticmethod
     @abstractmethod
     def pre(parent, info: ResolveInfo, **kwargs) -> PreHookResult:
@@ -53,7 +58,7 @@ class SchemaGenHooksBase(ABC):
     def __call__(self, *args, **kwargs):
         # Call pre-hook
         pre_result = self.pre(*args, **kwargs)
-        if pre_result == PreHookResult.STOP:
+        if pre_result is PreHookResult.STOP:
             raise SchemaGenHookException("Pre_Hook called STOP")
 
         # Call Function
@@ -69,5 +74,53 @@ class SchemaGenHooksBase(ABC):
         return decorated_func_retval
 
 
+################################
+# Build the hooked function as a plain closure (no hooks class instance / method dispatch per call)
+################################
+def make_hooked_func(pre: Callable[..., PreHookResult], post: Callable[..., Any],
+                     func_to_be_decorated: Callable) -> Callable:
+    def hooked_func(parent, info: ResolveInfo, **kwargs):
+        # Call pre-hook
+        pre_result = pre(parent, info, **kwargs)
+        if pre_result is PreHookResult.STOP:
+            raise SchemaGenHookException("Pre_Hook called STOP")
+
+        # Call Function
+        decorated_func_retval = func_to_be_decorated(parent, info, **kwargs)
+
+        # Call post-hook with the original arguments and the decorated function's returned value.
+        post_retval = post(parent, info, decorated_func_retval, **kwargs)
+        if post_retval:
+            # post wants to substitute the original function's data with its own.
+            return post_retval
+
+        # No 'post' hook data, return the original function's data, unmodified.
+        return decorated_func_retval
+
+    return hooked_func
+
+
+def is_plain_static_hooks_class(hooks_class) -> bool:
+    """True if the hooks class is fully described by its pre/post static methods
+    (no overridden __init__/__call__, so no per-instance state to keep)"""
+    return (
+        isinstance(hooks_class, type)
+        and issubclass(hooks_class, SchemaGenHooksBase)
+        and hooks_class.__init__ is SchemaGenHooksBase.__init__
+        and hooks_class.__call__ is SchemaGenHooksBase.__call__
+        and isinstance(inspect.getattr_static(hooks_class, "pre"), staticmethod)
+        and isinstance(inspect.getattr_static(hooks_class, "post"), staticmethod)
+    )
+
+
+def decorate_with_hooks(hooks_class: Type[SchemaGenHooksBase], func_to_be_decorated: Callable) -> Callable:
+    # Plain SchemaGenHooksBase subclasses get converted to a closure over their pre/post static methods.
+    if is_plain_static_hooks_class(hooks_class):
+        return make_hooked_func(hooks_class.pre, hooks_class.post, func_to_be_decorated)
+
+    # Anything else (custom __init__/__call__, instance methods, plain decorators) is instantiated as before.
+    return hooks_class(func_to_be_decorated)
+
+
 # Custom Type
 HookDictType = Dict[HookOperation, Type[SchemaGenHooksBase]]
@@ -1,6 +1,9 @@
-import gc
+import functools
+import threading
+import time
 from contextlib import contextmanager
-from typing import List, Dict, Callable, Union
+from dataclasses import dataclass
+from typing import List, Dict, Callable, Union, Tuple, Iterator, NamedTuple
 
 import graphene
 import sqlalchemy
@@ -10,27 +13,25 @@ from graphene_sqlalchemy import SQLAlchemyObjectType
 from graphene_sqlalchemy.converter import convert_sqlalchemy_type
 from graphene_sqlalchemy.registry import get_global_registry
 from graphql import GraphQLError
-from sqlalchemy import Column, inspect, ColumnDefault, Table, create_engine
-from sqlalchemy.exc import IntegrityError, DBAPIError
+from graphql.language.ast import Field, FragmentSpread, InlineFragment
+from sqlalchemy import Column, inspect, ColumnDefault, Table, create_engine, bindparam, select
+from sqlalchemy.exc import IntegrityError, DBAPIError, OperationalError
+from sqlalchemy.ext import baked
 from sqlalchemy.ext.declarative import DeclarativeMeta
-from sqlalchemy.orm import Mapper, Session, Query
-from sqlalchemy.orm import scoped_session, sessionmaker
-from sqlalchemy.orm.state import InstanceState
-from sqlalchemy.pool import NullPool
+from sqlalchemy.orm import Mapper, Session, Query, joinedload, selectinload
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.orm.exc import NoResultFound
+from sqlalchemy.orm.session import make_transient_to_detached
 
 from . import HookDictType
 from .extra import (
     FilterOperation,
-    create_or_get_graphql_filter_op_type_class,
+    FilterOp,
     OrderByOperation,
 )
 
-# this variable holds a list of all graphene.Enums created
-# with the table field names.
-#
-# we need to cache this and reuse accordingly since you cannot
-# have repeated schema names in a GraphQL Schema definition.
-from .hooks import HookOperation
+from .hooks import HookOperation, decorate_with_hooks
 
 ################################
 ################################
@@ -38,7 +39,21 @@ from .hooks import HookOperation
 ################################
 ################################
 
-__SCHEMAGEN_field_enum_by_sa_type_registry = {}
+# NOTE: the graphene types built from a SQLAlchemy model (filter/order_by params, field enums,
+# create/update inputs) are memoized per model class with functools.lru_cache on their builder
+# functions, since you cannot have repeated type names in a GraphQL Schema definition.
+
+# sessionmakers (bound to their engine/connection pool), by connection string.
+__SCHEMAGEN_sessionmaker_registry = {}
+__SCHEMAGEN_sessionmaker_registry_lock = threading.Lock()
+
+# resolve_<object> functions, by (queryable object, connection string, hooks),
+# so generators sharing the same models reuse the same resolvers.
+__SCHEMAGEN_resolve_func_registry = {}
+
+# Delete<Model> mutations, by (model class, connection string, hooks, autocommit). Unlike the create/update
+# mutations, they don't return the model's object type (which every generator registers anew), so they're shared.
+__SCHEMAGEN_delete_mutation_registry = {}
 
 
 ################################
@@ -48,6 +63,13 @@ class OurBaseSQLAlchemyObjectType(SQLAlchemyObjectType):
     class Meta:
         abstract = True
 
+    @classmethod
+    def is_type_of(cls, root, info):
+        # Column-only queries resolve to plain rows (see build_resolve_func), fields read them by attribute.
+        if SA_ROW_TYPE is not None and isinstance(root, SA_ROW_TYPE):
+            return True
+        return super().is_type_of(root, info)
+
 
 ################################
 ################################
@@ -58,14 +80,16 @@ class OurBaseSQLAlchemyObjectType(SQLAlchemyObjectType):
 ################################
 # Function to check if a SQLAlchemy's Model Class is Associative
 ################################
+@functools.lru_cache(maxsize=None)
 def is_association_table(sa_model_class) -> bool:
     mci: Mapper = inspect(sa_model_class)
-    return list(mci.columns.values()) == list(mci.primary_key)
+    return get_columns_from_sa_model_class(sa_model_class) == tuple(mci.primary_key)
 
 
 ################################
 # Get the SqlAlchemy's "Queryable Object"'s name (be it a Class or Table)
 ################################
+@functools.lru_cache(maxsize=None)
 def get_sa_queryable_name(sa_queryable_obj):
     if isinstance(sa_queryable_obj, Table):
         table_name = str(sa_queryable_obj.name)
@@ -81,7 +105,13 @@ def get_sa_queryable_name(sa_queryable_obj):
 def get_all_sa_model_classes(
         sa_model_base_class: DeclarativeMeta,
 ) -> List[DeclarativeMeta]:
-    # Get SQLAlchemy Class Registry
+    # SQLAlchemy 1.4+: the declarative registry already knows its mapped classes.
+    # (read from its class managers, which keep the declaration order - registry.mappers is an unordered set)
+    sa_registry = getattr(sa_model_base_class, "registry", None)
+    if sa_registry is not None:
+        return [manager.class_ for manager in list(sa_registry._managers) if manager.is_mapped]
+
+    # Older SQLAlchemy: scan the Class Registry, which also holds module markers and weakref holders.
     sa_class_registry: dict = getattr(sa_model_base_class, "_decl_class_registry")
 
     # List of all Model Classes from SQLAlchemy
@@ -94,12 +124,10 @@ def get_all_sa_model_classes(
 # Get all SQLAlchemy's Model Classless Tables (ex:many2many) as a List
 ################################
 def get_all_sa_classless_tables(sa_model_base_class: DeclarativeMeta, ) -> List[Table]:
-    # Get SQLAlchemy Class Registry
-    sa_class_registry: dict = getattr(sa_model_base_class, "_decl_class_registry")
-
     # List of all Model Classes from SQLAlchemy
     model_classes = get_all_sa_model_classes(sa_model_base_class)
-    model_classes_table_list = [o.__table__ for o in model_classes]
+    # (a set, so the membership checks below are O(1) - Tables hash by identity)
+    model_classes_tables = {o.__table__ for o in model_classes}
 
     # All Tables
     all_tables = sa_model_base_class.metadata.tables.values()
@@ -108,15 +136,45 @@ def get_all_sa_classless_tables(sa_model_base_class: DeclarativeMeta, ) -> List[
     classless_sa_tables = [
         table_obj
         for table_obj in all_tables
-        if table_obj not in model_classes_table_list
+        if table_obj not in model_classes_tables
     ]
 
     return classless_sa_tables
 
 
+################################
+# Snapshot of a SQLAlchemy's Model Class metadata, inspected once and shared by the schema passes
+################################
+@dataclass(frozen=True)
+class SAModelMeta:
+    sa_class: DeclarativeMeta
+    name: str
+    tablename: str
+    mapper: Mapper
+    columns: Tuple[Column, ...]
+    column_names: Tuple[str, ...]
+    is_association: bool
+
+    @classmethod
+    def from_sa_model_class(cls, sa_model_class: DeclarativeMeta) -> "SAModelMeta":
+        mci: Mapper = inspect(sa_model_class)
+        return cls(
+            sa_class=sa_model_class,
+            name=sa_model_class.__name__,
+            tablename=sa_model_class.__tablename__,
+            mapper=mci,
+            columns=get_columns_from_sa_model_class(sa_model_class),
+            column_names=get_column_names_from_sa_model_class(sa_model_class),
+            is_association=is_association_table(sa_model_class),
+        )
+
+
 ##################################################
 # SQLAlchemySchemaGenerator Helper Functions
 ##################################################
+# Only depends on the column's metadata, so it's worked out once per column.
+# (the returned dict is shared: unpack or copy it, don't modify it)
+@functools.lru_cache(maxsize=None)
 def create_input_field_args(sa_column) -> dict:
     field_args = {}
 
@@ -160,6 +218,24 @@ def create_input_field_args(sa_column) -> dict:
 
 def gql_query_build_sa_obj_type(sa_queryable_object: Union[DeclarativeMeta, Table],
                                 extra_metaclass_properties: Dict[str, object] = None):
+    # Without extra Meta properties, every generator ends up with the very same object type, so share it.
+    if not extra_metaclass_properties:
+        sa_obj_type_class = get_shared_gql_query_sa_obj_type(sa_queryable_object)
+
+        # Mutations pick the model's type from the registry, make sure that's the one being handed out.
+        get_global_registry().register(sa_obj_type_class)
+        return sa_obj_type_class
+
+    return create_gql_query_sa_obj_type(sa_queryable_object, extra_metaclass_properties)
+
+
+@functools.lru_cache(maxsize=None)
+def get_shared_gql_query_sa_obj_type(sa_queryable_object: Union[DeclarativeMeta, Table]):
+    return create_gql_query_sa_obj_type(sa_queryable_object)
+
+
+def create_gql_query_sa_obj_type(sa_queryable_object: Union[DeclarativeMeta, Table],
+                                 extra_metaclass_properties: Dict[str, object] = None):
     if not extra_metaclass_properties:
         extra_metaclass_properties = {}
 
@@ -192,6 +268,106 @@ def gql_query_build_sa_obj_type(sa_queryable_object: Union[DeclarativeMeta, Tabl
 order_by_ops = {"ASC": sqlalchemy.asc, "DESC": sqlalchemy.desc}
 
 
+################################
+# SQLAlchemy Operations for filters
+################################
+class SAFilterOperation(NamedTuple):
+    # func(sa_column, *params) returning the filter clause
+    clause: Callable
+    # func(filter_obj) returning the values for those params
+    values: Callable
+    # the param is a list (IN/NOTIN)
+    expanding: bool = False
+    # the values are rendered into the SQL instead of being bound (IS/ISNOT: "IS :param" is invalid on most dialects)
+    inline: bool = False
+
+
+# LIKE filters match the value anywhere in the column, literally: its own % and _ are escaped.
+LIKE_ESCAPE_CHAR = "\\"
+
+
+# (the same search terms come back over and over, e.g. autocomplete boxes)
+# (typed: 1 and True are the same dict key, but not the same pattern)
+@functools.lru_cache(maxsize=256, typed=True)
+def make_contains_like_pattern(value) -> str:
+    # Non-string filter values (ex.: IntFilterOp) are matched by their text, no value (null) matches any text.
+    value = "" if value is None else str(value)
+
+    escaped_value = (
+        value.replace(LIKE_ESCAPE_CHAR, LIKE_ESCAPE_CHAR * 2)
+        .replace("%", LIKE_ESCAPE_CHAR + "%")
+        .replace("_", LIKE_ESCAPE_CHAR + "_")
+    )
+    return f"%{escaped_value}%"
+
+
+# FilterOperation value --> SAFilterOperation
+# (keyed by value, as that's what graphene hands to the resolvers, and graphene's enum members aren't hashable)
+filter_ops = {
+    FilterOperation.EQ.value: SAFilterOperation(lambda c, v: c == v, lambda f: (f.v,)),
+    FilterOperation.NEQ.value: SAFilterOperation(lambda c, v: c != v, lambda f: (f.v,)),
+    FilterOperation.IS.value: SAFilterOperation(lambda c, v: c.is_(v), lambda f: (f.v,), inline=True),
+    FilterOperation.ISNOT.value: SAFilterOperation(lambda c, v: c.isnot(v), lambda f: (f.v,), inline=True),
+    FilterOperation.ISNULL.value: SAFilterOperation(lambda c: c.is_(None), lambda f: ()),
+    FilterOperation.ISNOTNULL.value: SAFilterOperation(lambda c: c.isnot(None), lambda f: ()),
+    FilterOperation.LT.value: SAFilterOperation(lambda c, v: c < v, lambda f: (f.v,)),
+    FilterOperation.GT.value: SAFilterOperation(lambda c, v: c > v, lambda f: (f.v,)),
+    FilterOperation.LIKE.value: SAFilterOperation(
+        lambda c, v: c.like(v, escape=LIKE_ESCAPE_CHAR), lambda f: (make_contains_like_pattern(f.v),)
+    ),
+    FilterOperation.NOTLIKE.value: SAFilterOperation(
+        lambda c, v: c.notlike(v, escape=LIKE_ESCAPE_CHAR), lambda f: (make_contains_like_pattern(f.v),)
+    ),
+    FilterOperation.ILIKE.value: SAFilterOperation(
+        lambda c, v: c.ilike(v, escape=LIKE_ESCAPE_CHAR), lambda f: (make_contains_like_pattern(f.v),)
+    ),
+    FilterOperation.NOTILIKE.value: SAFilterOperation(
+        lambda c, v: c.notilike(v, escape=LIKE_ESCAPE_CHAR), lambda f: (make_contains_like_pattern(f.v),)
+    ),
+    # List operators
+    FilterOperation.IN.value: SAFilterOperation(lambda c, vl: c.in_(vl), lambda f: (f.vl,), expanding=True),
+    FilterOperation.NOTIN.value: SAFilterOperation(lambda c, vl: c.notin_(vl), lambda f: (f.vl,), expanding=True),
+    FilterOperation.BETWEEN.value: SAFilterOperation(lambda c, lo, hi: c.between(lo, hi), lambda f: (f.vl[0], f.vl[1])),
+}
+
+
+################################
+# Baked Queries - the resolve_<object> functions' SQL is compiled once per "query shape"
+# (model + filtered columns/operations + order_by) and cached, only the params change per request.
+################################
+resolve_func_bakery = baked.bakery(size=512)
+
+# SQLAlchemy 1.4+ runs ORM select()s through Session.execute() and caches their compilation natively,
+# there the resolvers skip the legacy Query API (and the bakery) altogether.
+SA_ORM_SELECT_SUPPORTED = hasattr(sqlalchemy.engine, "Result")
+
+# Rows returned by Session.execute() (SQLAlchemy 1.4+)
+SA_ROW_TYPE = getattr(sqlalchemy.engine, "Row", None)
+
+# Session.get() (1.4+) replaces the legacy Query.get()
+SA_SESSION_GET_SUPPORTED = hasattr(Session, "get")
+
+
+def make_filter_bind_param_name(filter_index: int, value_index: int) -> str:
+    return f"filter_{filter_index}_{value_index}"
+
+
+def make_bound_filter_clauses(columns_by_name: Dict[str, Column], filter_key: tuple) -> list:
+    """Build the filter clauses for a filter_key, using bindparam()s for the (non-inline) values"""
+    filter_clauses = []
+    for filter_index, (filter_name, sa_filter_op, filter_key_values) in enumerate(filter_key):
+        if sa_filter_op.inline:
+            params = filter_key_values
+        else:
+            params = [
+                bindparam(make_filter_bind_param_name(filter_index, value_index), expanding=sa_filter_op.expanding)
+                for value_index in range(filter_key_values)
+            ]
+
+        filter_clauses.append(sa_filter_op.clause(columns_by_name[filter_name], *params))
+    return filter_clauses
+
+
 ################################
 # Create the resolve_MODELs function for "get_all"
 # - with filter
@@ -208,112 +384,488 @@ def make_resolve_func_maker_func_name(sa_queryable_obj) -> str:
 
 
 ################################
-# create an independent, scoped db connection
-# with a well defined lifetime
+# one engine (and connection pool) + sessionmaker per connection string, shared by every session
+# so requests reuse pooled connections instead of connecting (TCP/TLS/auth) on every resolver call
+################################
+def get_sessionmaker_from_sa_connection_string(sa_connection_string: str) -> sessionmaker:
+    sessionmaker_registry = __SCHEMAGEN_sessionmaker_registry
+
+    try:
+        return sessionmaker_registry[sa_connection_string]
+    except KeyError:
+        pass
+
+    with __SCHEMAGEN_sessionmaker_registry_lock:
+        db_sessionmaker = sessionmaker_registry.get(sa_connection_string)
+        if db_sessionmaker is None:
+            # Default pool for the dialect (QueuePool for client/server databases),
+            # pre_ping so connections that died while sitting in the pool get replaced.
+            engine = create_engine(sa_connection_string, convert_unicode=True, pool_pre_ping=True)
+            db_sessionmaker = sessionmaker_registry[sa_connection_string] = sessionmaker(
+                autocommit=False, autoflush=True, bind=engine
+            )
+
+    return db_sessionmaker
+
+
+################################
+# create an independent db session
 # uses 'context manager' so we can use the with: protocol
 ################################
+def create_db_session_from_sa_connection_string(sa_connection_string: str) -> Session:
+    """ Creates an open SQLAlchemy session.
+    """
+    return get_sessionmaker_from_sa_connection_string(sa_connection_string)()
+
+
 @contextmanager
-def scoped_db_session_from_sa_connection_string(sa_connection_string: str) -> Session:
-    """ Creates a context with an open SQLAlchemy session.
+def scoped_db_session_from_sa_connection_string(sa_connection_string: str) -> Iterator[Session]:
+    """ Creates a context with an open SQLAlchemy session, closed on the way out (its connection goes back to the pool).
     """
-    engine = create_engine(sa_connection_string, convert_unicode=True, poolclass=NullPool)
-    connection = engine.connect()
-    scoped_db_session = scoped_session(
-        sessionmaker(autocommit=False, autoflush=True, bind=engine)
-    )
-    yield scoped_db_session
+    s = create_db_session_from_sa_connection_string(sa_connection_string)
+    try:
+        yield s
+    finally:
+        # GraphQL resolves the returned objects' fields after this, so whatever they select is loaded
+        # before: the resolvers eager load the selected relationships, the mutations load their payload's
+        # (see load_payload_sa_relationships). Share one per request (open_request_db_sessions) to keep it open.
+        s.close()
 
-    # Leave the session and connection open, GraphQL
-    # scoped_db_session.close()
-    # connection.close()
+
+################################
+# share a single db session between all the resolvers/mutations of one GraphQL request,
+# stored in the request's info.context (see open_request_db_sessions), instead of opening a new one per field
+################################
+REQUEST_CONTEXT_DB_SESSIONS_KEY = "_schemagen_db_sessions"
+
+
+def get_request_db_sessions(context) -> Union[Dict[str, Session], None]:
+    # dict contexts (ex.: schema.execute(..., context_value={}))
+    if isinstance(context, dict):
+        return context.get(REQUEST_CONTEXT_DB_SESSIONS_KEY)
+
+    # object contexts (ex.: flask-graphql's request object), None when there's no context at all
+    return getattr(context, REQUEST_CONTEXT_DB_SESSIONS_KEY, None)
+
+
+def open_request_db_sessions(context):
+    """ Makes the resolvers/mutations executed with this context share one SQLAlchemy session (per connection
+    string), instead of opening and closing one each. Whoever opens them closes them: call
+    close_request_db_sessions(context) once the response is ready (see also request_db_sessions()).
+    """
+    if isinstance(context, dict):
+        context.setdefault(REQUEST_CONTEXT_DB_SESSIONS_KEY, {})
+    elif getattr(context, REQUEST_CONTEXT_DB_SESSIONS_KEY, None) is None:
+        setattr(context, REQUEST_CONTEXT_DB_SESSIONS_KEY, {})
+
+
+@contextmanager
+def request_scoped_db_session(info, sa_connection_string: str, autocommit: bool = True) -> Iterator[Session]:
+    """ Creates a context with the SQLAlchemy session shared by the whole GraphQL request.
+    """
+    sessions = get_request_db_sessions(getattr(info, "context", None))
+    if sessions is None:
+        if not autocommit:
+            # Nothing would ever commit this session (see commit_request_db_sessions): its changes would
+            # only be flushed, then rolled back by the close below, while the mutation reports success.
+            raise GraphQLError("autocommit=False needs the request's db sessions, see open_request_db_sessions()")
+
+        with scoped_db_session_from_sa_connection_string(sa_connection_string) as s:
+            yield s
+        return
+
+    s = sessions.get(sa_connection_string)
+    if s is None:
+        s = sessions[sa_connection_string] = create_db_session_from_sa_connection_string(sa_connection_string)
+
+    yield s
+
+
+class SchemaGenTransactionException(Exception):
+    pass
+
+
+# Session.info flag: a mutation failed and rolled the (autocommit=False) request's transaction back
+DB_SESSION_ROLLED_BACK_INFO_KEY = "_schemagen_rolled_back"
+
+
+def commit_request_db_sessions(context):
+    """ Commits the SQLAlchemy sessions shared by a GraphQL request (ex.: the generator was built with
+    autocommit=False, and the whole request should be committed at once, at the end).
+
+    If one of the request's mutations failed, its rollback already undid the mutations before it, so
+    nothing is committed: the sessions are rolled back and SchemaGenTransactionException is raised.
+    """
+    sessions = tuple((get_request_db_sessions(context) or {}).values())
+
+    if any(s.info.get(DB_SESSION_ROLLED_BACK_INFO_KEY) for s in sessions):
+        for s in sessions:
+            s.rollback()
+        raise SchemaGenTransactionException("A mutation of this request failed, the whole request was rolled back")
+
+    for s in sessions:
+        s.commit()
+
+
+def close_request_db_sessions(context):
+    """ Closes the SQLAlchemy sessions shared by a GraphQL request, handing their connections back to the pool.
+    (call it once the response is ready, ex.: in an after_request handler)
+    """
+    sessions = get_request_db_sessions(context) or {}
+    for s in sessions.values():
+        s.close()
+    sessions.clear()
+
+
+@contextmanager
+def request_db_sessions(context) -> Iterator:
+    """ Opens the request's shared SQLAlchemy sessions on `context`, and closes them on the way out:
+        with request_db_sessions({}) as context:
+            schema.execute(query, context_value=context)
+    """
+    open_request_db_sessions(context)
+    try:
+        yield context
+    finally:
+        close_request_db_sessions(context)
+
+
+def commit_or_flush_db_session(s: Session, autocommit: bool):
+    if autocommit:
+        s.commit()
+    else:
+        # Send the changes to the database, the transaction stays open for the caller to commit.
+        s.flush()
+
+
+def rollback_db_session(s: Session, autocommit: bool):
+    s.rollback()
+
+    if not autocommit:
+        # The rollback also undid whatever the request's earlier mutations flushed: the request can't be
+        # committed anymore (see commit_request_db_sessions), and its later mutations are refused.
+        s.info[DB_SESSION_ROLLED_BACK_INFO_KEY] = True
+
+
+def raise_if_db_session_rolled_back(s: Session):
+    if s.info.get(DB_SESSION_ROLLED_BACK_INFO_KEY):
+        raise GraphQLError("An earlier mutation of this request failed, the request was rolled back")
+
+
+def decorate_mutate_func_with_transaction_hook(hooks: HookDictType, mutate_func: Callable) -> Callable:
+    transaction_hook = hooks.get(HookOperation.TRANSACTION)
+    if transaction_hook:
+        return decorate_with_hooks(transaction_hook, mutate_func)
+    return mutate_func
+
+
+# func(mapper) returning the loader options (ex.: [selectinload(Model.children)], raiseload("*"))
+# applied to a model's get_all query, so nested relationship fields don't lazy load one row at a time (N+1).
+LoaderOptionsFuncType = Callable[[Mapper], list]
+
+
+def get_graphql_selections(info) -> Iterator[Field]:
+    """ The fields selected right under the GraphQL field being resolved (fragments expanded in place).
+    """
+    fragments = getattr(info, "fragments", None)
+    for field_node in getattr(info, "field_nodes", None) or info.field_asts:
+        if field_node.selection_set is not None:
+            yield from iter_graphql_selected_fields(field_node.selection_set.selections, fragments)
+
+
+def iter_graphql_selected_fields(selections, fragments: Dict[str, object] = None) -> Iterator[Field]:
+    """ The fields of the selections, with the fragment spreads (...Name) and inline fragments (... on Type)
+    replaced by their own fields.
+    """
+    for selection in selections:
+        if isinstance(selection, Field):
+            yield selection
+        elif isinstance(selection, InlineFragment):
+            yield from iter_graphql_selected_fields(selection.selection_set.selections, fragments)
+        elif isinstance(selection, FragmentSpread):
+            fragment = fragments.get(selection.name.value) if fragments else None
+            if fragment is not None:
+                yield from iter_graphql_selected_fields(fragment.selection_set.selections, fragments)
+
+
+@functools.lru_cache(maxsize=None)
+def get_sa_relationship_names_by_graphql_field_name(sa_mapper: Mapper) -> Dict[str, str]:
+    # GraphQL field name (camelCased or not, depending on the schema) -> relationship name
+    relationship_names_by_field_name = {}
+    for relationship_name in sa_mapper.relationships.keys():
+        relationship_names_by_field_name[relationship_name] = relationship_name
+        relationship_names_by_field_name[cached_to_camel_case(relationship_name)] = relationship_name
+    return relationship_names_by_field_name
+
+
+def get_selected_sa_relationship_paths(
+        selections, sa_mapper: Mapper, parent_path: Tuple[str, ...] = (), fragments: Dict[str, object] = None
+) -> Tuple[Tuple[str, ...], ...]:
+    """ Paths (tuples of relationship names, starting at sa_mapper) of every relationship selected
+    by the GraphQL selections, at any depth (through fragments too, given the query's fragments).
+    """
+    relationship_names_by_field_name = get_sa_relationship_names_by_graphql_field_name(sa_mapper)
+    selected_relationship_paths = []
+
+    for selection in iter_graphql_selected_fields(selections, fragments):
+        relationship_name = relationship_names_by_field_name.get(selection.name.value)
+        if relationship_name is None:
+            continue
+
+        relationship_path = parent_path + (relationship_name,)
+        if relationship_path not in selected_relationship_paths:
+            selected_relationship_paths.append(relationship_path)
+
+        if selection.selection_set is not None:
+            for nested_relationship_path in get_selected_sa_relationship_paths(
+                    selection.selection_set.selections, sa_mapper.relationships[relationship_name].mapper,
+                    relationship_path, fragments
+            ):
+                if nested_relationship_path not in selected_relationship_paths:
+                    selected_relationship_paths.append(nested_relationship_path)
+
+    return tuple(selected_relationship_paths)
+
+
+def load_payload_sa_relationships(info, payload_field_name: str, sa_obj):
+    """ Loads the relationships a mutation's payload selects under its object, while the session is at hand
+    (the session of a request without a context is closed as soon as the mutation returns).
+    """
+    payload_field_names = {payload_field_name, cached_to_camel_case(payload_field_name)}
+    fragments = getattr(info, "fragments", None)
+    sa_mapper: Mapper = inspect(type(sa_obj))
+
+    for selection in get_graphql_selections(info):
+        if selection.name.value not in payload_field_names or selection.selection_set is None:
+            continue
+
+        for relationship_path in get_selected_sa_relationship_paths(
+                selection.selection_set.selections, sa_mapper, fragments=fragments
+        ):
+            # getattr() down the path, every object on the way loads its relationship (already loaded ones are free)
+            sa_objs, path_mapper = [sa_obj], sa_mapper
+            for relationship_name in relationship_path:
+                relationship = path_mapper.relationships[relationship_name]
+                related_sa_objs = []
+                for path_sa_obj in sa_objs:
+                    related = getattr(path_sa_obj, relationship_name)
+                    if relationship.uselist:
+                        related_sa_objs.extend(related)
+                    elif related is not None:
+                        related_sa_objs.append(related)
+                sa_objs, path_mapper = related_sa_objs, relationship.mapper
+
+
+def get_selected_sa_column_keys(info, column_keys_by_field_name: Dict[str, str]) -> Union[Tuple[str, ...], None]:
+    """ Keys of the columns selected by the GraphQL query being resolved,
+    or None if it selects anything else (relationships, composites...)
+    """
+    selected_column_keys = []
+
+    for selection in get_graphql_selections(info):
+        column_key = column_keys_by_field_name.get(selection.name.value)
+        if column_key is None:
+            return None
+
+        if column_key not in selected_column_keys:
+            selected_column_keys.append(column_key)
+
+    return tuple(selected_column_keys) or None
 
 
 def make_resolve_func_maker(
-        sa_queryable_obj: DeclarativeMeta, sa_connection_string: str, hooks: HookDictType
+        sa_queryable_obj: DeclarativeMeta, sa_connection_string: str, hooks: HookDictType,
+        loader_options: LoaderOptionsFuncType = None
+) -> Callable:
+    resolve_func_registry = __SCHEMAGEN_resolve_func_registry
+
+    # hooks is a dict (unhashable), so key on a snapshot of its items.
+    resolve_func_key = (sa_queryable_obj, sa_connection_string, frozenset(hooks.items()), loader_options)
+    if resolve_func_key not in resolve_func_registry:
+        resolve_func_registry[resolve_func_key] = build_resolve_func(
+            sa_queryable_obj, sa_connection_string, hooks, loader_options
+        )
+
+    return resolve_func_registry[resolve_func_key]
+
+
+def build_resolve_func(
+        sa_queryable_obj: DeclarativeMeta, sa_connection_string: str, hooks: HookDictType,
+        loader_options: LoaderOptionsFuncType = None
 ) -> Callable:
     # Get Mapper for SQLAlchemy's Model Class
 
     m: Mapper = inspect(sa_queryable_obj)
 
-    def resolve_func(_parent, _info, **kwargs):
-        with scoped_db_session_from_sa_connection_string(sa_connection_string) as s:
+    # The Mapper never changes for a given class, so grab its columns once, outside resolve_func.
+    columns_by_name: Dict[str, Column] = dict(m.columns.items())
 
-            nonlocal sa_queryable_obj
+    # Every possible ORDER BY clause, (column name, "ASC"/"DESC") --> clause, built once too.
+    order_by_clauses = {
+        (column_name, order_by_op_name): order_by_function(column)
+        for column_name, column in columns_by_name.items()
+        for order_by_op_name, order_by_function in order_by_ops.items()
+    }
 
-            ################################
-            # Base Query
-            ################################
-            q = s.query(sa_queryable_obj)
+    is_table = isinstance(sa_queryable_obj, Table)
+
+    # Loader options for this model, built once. (classless tables have no relationships to load)
+    query_options = tuple(loader_options(m)) if loader_options and not is_table else ()
+
+    # GraphQL field name -> column attribute key, for the queries that only select columns: those skip the ORM
+    # instances (and their identity map/state bookkeeping) and read plain rows. SQLAlchemy 1.4+ only, and only
+    # without a READ hook, as hooks expect model instances. (left out: keys clashing with Row's own attributes,
+    # and fields with their own resolver, ex.: graphene_sqlalchemy's resolve_id reads the instance's mapper)
+    column_keys_by_field_name: Dict[str, str] = {}
+    if SA_ORM_SELECT_SUPPORTED and not is_table and not hooks.get(HookOperation.READ):
+        for column_key in m.column_attrs.keys():
+            if not hasattr(SA_ROW_TYPE, column_key) and not hasattr(OurBaseSQLAlchemyObjectType, f"resolve_{column_key}"):
+                column_keys_by_field_name[column_key] = column_key
+                column_keys_by_field_name[cached_to_camel_case(column_key)] = column_key
+
+    # Eager load the relationships a query selects, at any depth: collections with a second SELECT ... IN,
+    # many-to-one with a JOIN. Built once per combination of selected relationship paths.
+    @functools.lru_cache(maxsize=128)
+    def make_eager_load_options(relationship_paths: Tuple[Tuple[str, ...], ...]) -> tuple:
+        eager_load_options = []
+        for relationship_path in relationship_paths:
+            loader, path_mapper = None, m
+            for relationship_name in relationship_path:
+                relationship = path_mapper.relationships[relationship_name]
+                relationship_attribute = getattr(path_mapper.class_, relationship_name)
+
+                # the first one is a loader option, the nested ones are chained on it (loader.selectinload(...))
+                load_strategy = selectinload if relationship.uselist else joinedload
+                if loader is None:
+                    loader = load_strategy(relationship_attribute)
+                else:
+                    loader = getattr(loader, load_strategy.__name__)(relationship_attribute)
+
+                path_mapper = relationship.mapper
+            eager_load_options.append(loader)
+        return tuple(eager_load_options)
+
+    # The query field's arguments are spelled out, so they're plain locals instead of kwargs.get() lookups.
+    def resolve_func(_parent, _info, filters=None, order_by=None, page=1, perpage=50):
+        # Validate the pagination up front (an explicit null skips the arguments' defaults),
+        # an empty page doesn't need to go to the database at all.
+        if perpage is None or perpage < 0:
+            raise GraphQLError("perpage must be zero or a positive number")
+        if perpage == 0:
+            return []
+        page = page or 1
+
+        with request_scoped_db_session(_info, sa_connection_string) as s:
+
+            bind_params = {}
 
             ################################
             # Filter
             ################################
 
             # List of Filters
-            filter_obj_list = kwargs.get("filters", {})
-
-            for filter_obj in filter_obj_list:
-                for filter_name in filter_obj:
-                    filter_obj = filter_obj[filter_name]
-
-                    sa_column: Column = m.columns[filter_name]
-
-                    if FilterOperation.get(filter_obj.op) == FilterOperation.EQ:
-                        q = q.filter(sa_column == filter_obj.v)
-                    elif FilterOperation.get(filter_obj.op) == FilterOperation.NEQ:
-                        q = q.filter(sa_column != filter_obj.v)
-                    elif FilterOperation.get(filter_obj.op) == FilterOperation.IS:
-                        q = q.filter(sa_column.is_(filter_obj.v))
-                    elif FilterOperation.get(filter_obj.op) == FilterOperation.ISNOT:
-                        q = q.filter(sa_column.isnot(filter_obj.v))
-                    elif FilterOperation.get(filter_obj.op) == FilterOperation.ISNULL:
-                        q = q.filter(sa_column.is_(None))
-                    elif FilterOperation.get(filter_obj.op) == FilterOperation.ISNOTNULL:
-                        q = q.filter(sa_column.isnot(None))
-                    elif FilterOperation.get(filter_obj.op) == FilterOperation.LT:
-                        q = q.filter(sa_column < filter_obj.v)
-                    elif FilterOperation.get(filter_obj.op) == FilterOperation.GT:
-                        q = q.filter(sa_column > filter_obj.v)
-                    elif FilterOperation.get(filter_obj.op) == FilterOperation.LIKE:
-                        q = q.filter(sa_column.like(f"%{filter_obj.v}%"))
-                    elif FilterOperation.get(filter_obj.op) == FilterOperation.NOTLIKE:
-                        q = q.filter(sa_column.notlike(f"%{filter_obj.v}%"))
-                    elif FilterOperation.get(filter_obj.op) == FilterOperation.ILIKE:
-                        q = q.filter(sa_column.ilike(f"%{filter_obj.v}%"))
-                    elif FilterOperation.get(filter_obj.op) == FilterOperation.NOTILIKE:
-                        q = q.filter(sa_column.notilike(f"%{filter_obj.v}%"))
-                    elif FilterOperation.get(filter_obj.op) == FilterOperation.IN:
-                        q = q.filter(sa_column.in_(filter_obj.vl))
-                    elif FilterOperation.get(filter_obj.op) == FilterOperation.NOTIN:
-                        q = q.filter(sa_column.notin_(filter_obj.vl))
-                    elif FilterOperation.get(filter_obj.op) == FilterOperation.BETWEEN:
-                        q = q.filter(sa_column.between(filter_obj.vl[0], filter_obj.vl[1]))
+            filter_obj_list = filters or ()
+
+            # (column name, SAFilterOperation, inlined values or count of bound values) for each filter,
+            # this is what identifies the filtered query in the bakery.
+            filter_key = []
+
+            # Each entry is a {column name: filter_obj} wrapper, walk them all in a single pass.
+            for filter_wrapper in filter_obj_list:
+                for filter_name, filter_obj in filter_wrapper.items():
+                    # Resolve the operation once, everything downstream uses the resolved SAFilterOperation.
+                    sa_filter_op: SAFilterOperation = filter_ops[filter_obj.op]
+                    filter_values = sa_filter_op.values(filter_obj)
+
+                    if sa_filter_op.inline:
+                        filter_key.append((filter_name, sa_filter_op, filter_values))
+                    else:
+                        for value_index, value in enumerate(filter_values):
+                            bind_params[make_filter_bind_param_name(len(filter_key), value_index)] = value
+                        filter_key.append((filter_name, sa_filter_op, len(filter_values)))
+
+            filter_key = tuple(filter_key)
 
             ################################
             # ORDER_BY
             ################################
-            order_by_params = kwargs.get("order_by")
+            order_by_params = order_by
 
             if order_by_params:
-                order_by_function = order_by_ops[order_by_params.o]
-                order_column = m.columns[order_by_params.f]
-
-                q = q.order_by(order_by_function(order_column))
+                order_by_clause = order_by_clauses[order_by_params.f, order_by_params.o]
 
             ################################
             # LIMIT / OFFSET (Pagination)
             ################################
 
             # Pagination
-            page = max(0, kwargs.get("page") - 1)
-            perpage = kwargs.get("perpage")
+            page = max(0, page - 1)
+
+            bind_params["perpage"] = perpage
+            bind_params["offset"] = page * perpage
+
+            ################################
+            # Eager loading of the selected relationships (loader_options go last, so they win)
+            ################################
+            selected_relationship_paths = () if is_table else get_selected_sa_relationship_paths(
+                get_graphql_selections(_info), m, fragments=getattr(_info, "fragments", None)
+            )
+            options = make_eager_load_options(selected_relationship_paths) + query_options
+
+            if SA_ORM_SELECT_SUPPORTED:
+                ################################
+                # SQLAlchemy 1.4+: 2.0-style select(), its compiled form is cached by SQLAlchemy itself
+                ################################
+                selected_column_keys = (
+                    get_selected_sa_column_keys(_info, column_keys_by_field_name)
+                    if column_keys_by_field_name else None
+                )
+
+                if selected_column_keys:
+                    stmt = select(*[getattr(sa_queryable_obj, column_key) for column_key in selected_column_keys])
+                else:
+                    stmt = select(sa_queryable_obj)
+
+                    if options:
+                        stmt = stmt.options(*options)
 
-            # Apply Pagination
-            q = q.limit(perpage).offset(page * perpage)
+                # Apply all filters at once (AND)
+                if filter_key:
+                    stmt = stmt.where(*make_bound_filter_clauses(columns_by_name, filter_key))
 
-            results = q.all()
+                if order_by_params:
+                    stmt = stmt.order_by(order_by_clause)
 
-            #gc.collect()
+                stmt = stmt.limit(bindparam("perpage")).offset(bindparam("offset"))
+
+                result = s.execute(stmt, bind_params)
+
+                # Classless tables and column-only selects come back as plain rows, mapped classes as their instances
+                results = result.all() if is_table or selected_column_keys else result.scalars().all()
+            else:
+                ################################
+                # Older SQLAlchemy: Baked Query
+                ################################
+                bq = resolve_func_bakery(lambda session: session.query(sa_queryable_obj), sa_queryable_obj)
+
+                if options:
+                    bq.add_criteria(lambda q: q.options(*options), selected_relationship_paths, query_options)
+
+                # Apply all filters at once (AND)
+                if filter_key:
+                    bq.add_criteria(
+                        lambda q: q.filter(*make_bound_filter_clauses(columns_by_name, filter_key)), filter_key
+                    )
+
+                if order_by_params:
+                    bq.add_criteria(
+                        lambda q: q.order_by(order_by_clause), order_by_params.f, order_by_params.o
+                    )
+
+                # Apply Pagination
+                bq += lambda q: q.limit(bindparam("perpage")).offset(bindparam("offset"))
+
+                results = bq(s).params(bind_params).all()
 
         return results
 
@@ -323,7 +875,7 @@ def make_resolve_func_maker(
     # Decorate resolve_func with the provided hooks class, if we have one.
     read_hook = hooks.get(HookOperation.READ)
     if read_hook:
-        final_resolve_func = read_hook(resolve_func)
+        final_resolve_func = decorate_with_hooks(read_hook, resolve_func)
 
     # Generate Resolver Function Name
     # Example: "resolve_Users"
@@ -348,24 +900,36 @@ def make_gql_object_description_from_sa_model_class(mc: DeclarativeMeta) -> str:
 ################################
 # Convert any SQLAlchemy Model Instance (Query Result) to a plain dict()
 ################################
-def sa_instance_to_dict(mc: DeclarativeMeta):
-    """Transform a SQLAlchemy instance to a sanitized dict, without instance/control vars"""
-    mci: InstanceState = inspect(mc)
+def sa_instance_to_dict(mc: DeclarativeMeta, column_names: Tuple[str, ...] = None):
+    """Transform a SQLAlchemy instance to a sanitized dict, without instance/control vars
+
+    column_names can be precomputed once per model (ex.: SAModelMeta.column_names) to skip the lookup.
+    """
+    if column_names is None:
+        column_names = get_column_names_from_sa_model_class(type(mc))
+
+    # Loaded attributes are read straight from the instance dict, getattr() is only
+    # needed for the unloaded (expired/deferred) ones, so SQLAlchemy can load them.
+    instance_dict = mc.__dict__
+    return {
+        name: instance_dict[name] if name in instance_dict else getattr(mc, name) for name in column_names
+    }
 
-    column_list = get_columns_from_sa_model_class(mci.class_)
 
-    # get obj's columns from <Mapper>.columns and do a direct getattr() using those names
-    return {c.name: getattr(mc, c.name) for c in column_list}
+@functools.lru_cache(maxsize=None)
+def get_column_names_from_sa_model_class(sa_model_class: DeclarativeMeta) -> Tuple[str, ...]:
+    return tuple(c.name for c in get_columns_from_sa_model_class(sa_model_class))
 
 
 ################################
 # Grab a List of SQLAlchemy Columns from a SQLAlchemy Model
 ################################
-def get_columns_from_sa_model_class(sa_model_class: DeclarativeMeta) -> List[Column]:
-    # Model Classes return a inspection-able SQLAlchemy "Mapper" object.
+@functools.lru_cache(maxsize=None)
+def get_columns_from_sa_model_class(sa_model_class: DeclarativeMeta) -> Tuple[Column, ...]:
+    # Model Classes return a inspection-able SQLAlchemy "Mapper" object, whose columns never change.
     mci: Mapper = inspect(sa_model_class)
 
-    return [column for column in mci.columns]
+    return tuple(mci.columns)
 
 
 ################################
@@ -378,12 +942,17 @@ mask_type = Dict[SubclassWithMeta_Meta, SubclassWithMeta_Meta]
 mask_ID_to_Int: mask_type = {graphene.ID: graphene.Int}
 
 
+# graphene_sqlalchemy's conversion only depends on the column (and the global registry, which
+# doesn't change after schema generation), so convert each column only once.
+@functools.lru_cache(maxsize=None)
+def convert_sa_column_to_graphql_type(column: Column) -> SubclassWithMeta_Meta:
+    return convert_sqlalchemy_type(column.type, column, get_global_registry())
+
+
 def get_graphql_field_type_for_sa_column(
         column: Column, mask: mask_type = None
 ) -> SubclassWithMeta_Meta:
-    original_graphql_type = convert_sqlalchemy_type(
-        column.type, column, get_global_registry()
-    )
+    original_graphql_type = convert_sa_column_to_graphql_type(column)
 
     # Mask type using the mask argument.
     if mask:
@@ -401,6 +970,7 @@ def get_graphql_field_type_for_sa_column(
 ################################
 
 
+@functools.lru_cache(maxsize=None)
 def create_gql_get_query_filter_input_object_type_from_sa_model(mc: DeclarativeMeta):
     sa_column_list = get_columns_from_sa_model_class(mc)
 
@@ -411,7 +981,7 @@ def create_gql_get_query_filter_input_object_type_from_sa_model(mc: DeclarativeM
             sa_column, mask=mask_ID_to_Int
         )
 
-        fop_class = create_or_get_graphql_filter_op_type_class(graphql_column_type)
+        fop_class = FilterOp[graphql_column_type]
 
         class_items[sa_column.name] = graphene.Field(fop_class)
 
@@ -426,17 +996,16 @@ def create_gql_get_query_filter_input_object_type_from_sa_model(mc: DeclarativeM
 ################################
 # Create Graphene.Enum with the Column Names from a SQLAlchemy Model Class
 ################################
-def create_or_get_gql_field_list_enum_from_sa_model(mc: DeclarativeMeta):
-    global __SCHEMAGEN_field_enum_by_sa_type_registry
-    field_enum_registry = __SCHEMAGEN_field_enum_by_sa_type_registry
 
-    mc_name = mc.__name__
-    if mc_name in field_enum_registry:
-        return field_enum_registry[mc_name]
+# Column names repeat a lot across models (id, name, created_at, ...), convert each one only once.
+cached_to_camel_case = functools.lru_cache(maxsize=4096)(to_camel_case)
+
 
+@functools.lru_cache(maxsize=None)
+def create_or_get_gql_field_list_enum_from_sa_model(mc: DeclarativeMeta):
     # Todo: Respect camelCase setting from graphene. for now this is hardcoded to convert to camelcase
     def gen_enum_entry(field_name):
-        return to_camel_case(field_name), field_name
+        return cached_to_camel_case(field_name), field_name
 
     sa_column_list = get_columns_from_sa_model_class(mc)
     return graphene.Enum(
@@ -449,6 +1018,7 @@ def create_or_get_gql_field_list_enum_from_sa_model(mc: DeclarativeMeta):
 ################################
 
 
+@functools.lru_cache(maxsize=None)
 def create_gql_get_query_order_by_filter_input_object_type_from_sa_model(
         mc: DeclarativeMeta,
 ):
@@ -476,6 +1046,7 @@ def create_gql_get_query_order_by_filter_input_object_type_from_sa_model(
 ################################
 # Object that validates the input arguments of the Update<Model> function
 ################################
+@functools.lru_cache(maxsize=None)
 def create_gql_update_input_object_type_from_sa_class(
         sa_model_class: DeclarativeMeta,
 ) -> type:
@@ -511,6 +1082,7 @@ def create_gql_update_input_object_type_from_sa_class(
 # "Update" Mutation's Argument Class
 # use the method above to get the proper input object type for this
 ################################
+@functools.lru_cache(maxsize=None)
 def create_gql_mutation_update_arguments_class(sa_model_class: DeclarativeMeta) -> type:
     obj_input_class = create_gql_update_input_object_type_from_sa_class(sa_model_class)
 
@@ -519,26 +1091,115 @@ def create_gql_mutation_update_arguments_class(sa_model_class: DeclarativeMeta)
 
     arg_class_items = {argument_name: obj_input_class(required=True)}
 
+    # NOTE: no __slots__ on the Arguments (or Meta) containers: they're never instantiated, and graphene
+    # reads every public-ish class attribute with props(), so "__slots__" would turn into a mutation argument.
     arguments_class = type("Arguments", (), arg_class_items)
 
     return arguments_class
 
 
+################################
+# Convert an incoming PRIMARY KEY ID to its column's Python type
+################################
+def convert_pk_id_to_sa_column_type(sa_column: Column, pk_id):
+    # ID arguments arrive as strings, the identity map (and the comparison) needs the column's own type.
+    try:
+        python_type = sa_column.type.python_type
+    except NotImplementedError:
+        return pk_id
+    return pk_id if isinstance(pk_id, python_type) else python_type(pk_id)
+
+
 ################################
 # Get the Original Object by PRIMARY KEY ID
 ################################
 def get_sa_obj_by_pk_id(
-        sa_class: DeclarativeMeta, pk_name: str, pk_id: int, s: Session
+        sa_class: DeclarativeMeta, pk_name: str, pk_id, s: Session
 ) -> DeclarativeMeta:
-    x = s.query(sa_class).filter(getattr(sa_class, pk_name) == int(pk_id)).one()
+    mapper: Mapper = inspect(sa_class)
+    pk_id = convert_pk_id_to_sa_column_type(mapper.local_table.c[pk_name], pk_id)
+
+    # Composite primary keys can't be looked up by this single pk_id, filter on it instead.
+    if len(mapper.primary_key) > 1:
+        return s.query(sa_class).filter(getattr(sa_class, pk_name) == pk_id).one()
+
+    # Identity map first, then a primary key lookup (Session.get() is SQLAlchemy 1.4+, Query.get() before)
+    x = s.get(sa_class, pk_id) if SA_SESSION_GET_SUPPORTED else s.query(sa_class).get(pk_id)
+    if x is None:
+        raise NoResultFound("No row was found for one()")
     return x
 
 
+################################
+# UPDATE ... RETURNING support
+################################
+def sa_dialect_supports_update_returning(dialect) -> bool:
+    # SQLAlchemy 2.0 (update_returning) / 1.4 (full_returning) tell us, 1.3 only compiles it on postgresql.
+    for returning_attr in ("update_returning", "full_returning"):
+        if hasattr(dialect, returning_attr):
+            return bool(getattr(dialect, returning_attr))
+    return dialect.name == "postgresql"
+
+
+def sa_mapper_supports_update_returning(mapper: Mapper) -> bool:
+    """UPDATE ... RETURNING skips the unit of work, so it's only for mappers with nothing relying on it:
+    no validators, mapper/attribute events, version counter, inheritance or Python-side onupdate defaults."""
+    if len(mapper.tables) != 1 or mapper.inherits is not None or mapper.polymorphic_on is not None:
+        return False
+
+    if mapper.validators or mapper.version_id_col is not None:
+        return False
+
+    if mapper.dispatch.before_update or mapper.dispatch.after_update:
+        return False
+
+    if any(mapper.class_manager[prop.key].dispatch.set for prop in mapper.column_attrs):
+        return False
+
+    return all(sa_column.onupdate is None for sa_column in mapper.local_table.c)
+
+
+def update_sa_obj_by_pk_id_returning(
+        sa_class: DeclarativeMeta, pk_name: str, pk_id, update_values: dict, s: Session,
+        autocommit: bool = True
+) -> DeclarativeMeta:
+    """UPDATE the row in a single round-trip (COMMITting it when autocommit), the RETURNING row becomes the
+    (clean) updated object"""
+    mapper: Mapper = inspect(sa_class)
+    sa_table: Table = mapper.local_table
+    pk_id = convert_pk_id_to_sa_column_type(sa_table.c[pk_name], pk_id)
+
+    stmt = (
+        sa_table.update()
+        .where(sa_table.c[pk_name] == pk_id)
+        .values(update_values)
+        .returning(*sa_table.c)
+    )
+    updated_row = s.execute(stmt).first()
+    if updated_row is None:
+        raise NoResultFound("No row was found for one()")
+
+    if autocommit:
+        s.commit()
+
+    # Rows are mappings through ._mapping since SQLAlchemy 1.4
+    updated_row = getattr(updated_row, "_mapping", updated_row)
+
+    # Build the instance as if it was loaded, and merge it without going back to the database.
+    updated_sa_obj = mapper.class_manager.new_instance()
+    for sa_column in sa_table.c:
+        set_committed_value(updated_sa_obj, mapper.get_property_by_column(sa_column).key, updated_row[sa_column])
+    make_transient_to_detached(updated_sa_obj)
+
+    return s.merge(updated_sa_obj, load=False)
+
+
 ################################
 # update<Model> MAIN FUNCTION
 ################################
 def create_update_obj_mutation_object(
-        sa_model_class: DeclarativeMeta, sa_connection_string: str, hooks: HookDictType
+        sa_model_class: DeclarativeMeta, sa_connection_string: str, hooks: HookDictType,
+        autocommit: bool = True
 ) -> type:
     cls_name: str = sa_model_class.__name__
 
@@ -546,6 +1207,9 @@ def create_update_obj_mutation_object(
     updated_graphql_obj_name = cls_name
 
     # get the graphql object associated with this SQLAlchemy Model Class
+    # (looked up once per builder, but never cached across builders: the shared per-model type is re-registered
+    # every time a generator hands it out, while a type built with extra Meta properties is registered on its own -
+    # the registry keeps the latest one, which is the one this schema's query field is using.)
     gql_object = get_global_registry().get_type_for_model(sa_model_class)
 
     ################################
@@ -570,7 +1234,15 @@ def create_update_obj_mutation_object(
     param_name = f"{cls_name.lower()}_data"
 
     # primary key name
-    pk_name = inspect(sa_model_class).primary_key[0].name
+    sa_model_mapper: Mapper = inspect(sa_model_class)
+    pk_name = sa_model_mapper.primary_key[0].name
+
+    # Columns an update may set: everything but the primary key, as re-setting it can trigger unwanted
+    # dirty() pkid updates that might fail. (also drops anything in the input that isn't a column)
+    updatable_column_names = frozenset(get_column_names_from_sa_model_class(sa_model_class)) - {pk_name}
+
+    # UPDATE ... RETURNING only for plain single table models (see sa_mapper_supports_update_returning)
+    update_returning_possible = sa_mapper_supports_update_returning(sa_model_mapper)
 
     # Mutate Function Entry Point
     def mutate_func(root, info, **kwargs):
@@ -578,50 +1250,62 @@ def create_update_obj_mutation_object(
         # Get the new instance data from kwargs[param_name]
         incoming_update_request: dict = kwargs.get(param_name)
 
-        with scoped_db_session_from_sa_connection_string(sa_connection_string) as s:
+        update_values = {k: incoming_update_request[k] for k in updatable_column_names & incoming_update_request.keys()}
+
+        with request_scoped_db_session(info, sa_connection_string, autocommit) as s:
             s: Session
+            raise_if_db_session_rolled_back(s)
 
             # #### SQLAlchemy TIME ####
 
-            # 1- get original entity from SA
-            to_update_sa_obj = get_sa_obj_by_pk_id(
-                sa_model_class, pk_name, incoming_update_request[pk_name], s
-            )
-
-            # 2- modify it
-            for k, v in incoming_update_request.items():
-                # skip re-setting the primary key as that can trigger unwanted dirty() pkid
-                # updates that might fail.
-                if k == pk_name:
-                    continue
-
-                # Update the attribute value
-                setattr(to_update_sa_obj, k, v)
-
             try:
-                # 3- add to session
-                s.add(to_update_sa_obj)
-
-                # 4- commit
-                s.commit()
+                if update_values and update_returning_possible and sa_dialect_supports_update_returning(
+                        s.get_bind().dialect):
+                    # 1..4 - UPDATE ... RETURNING, then commit
+                    to_update_sa_obj = update_sa_obj_by_pk_id_returning(
+                        sa_model_class, pk_name, incoming_update_request[pk_name], update_values, s, autocommit
+                    )
+                else:
+                    # 1- get original entity from SA
+                    to_update_sa_obj = get_sa_obj_by_pk_id(
+                        sa_model_class, pk_name, incoming_update_request[pk_name], s
+                    )
+
+                    # 2- modify it
+                    for k, v in update_values.items():
+                        # Update the attribute value
+                        setattr(to_update_sa_obj, k, v)
+
+                    # 3- add to session
+                    s.add(to_update_sa_obj)
+
+                    # 4- commit (or just flush, leaving the commit to the caller)
+                    commit_or_flush_db_session(s, autocommit)
+
+                    # 5- the commit expired it, load it back while the session is at hand
+                    if autocommit:
+                        s.refresh(to_update_sa_obj)
             except DBAPIError as e:
-                s.rollback()
-                s.flush()
-                s.close()
-                raise GraphQLError(e.args)
+                rollback_db_session(s, autocommit)
+                raise GraphQLError(str(e.orig)) from e
+
+            # Load the relationships the payload selects, while the session is at hand.
+            load_payload_sa_relationships(info, updated_graphql_obj_name, to_update_sa_obj)
 
         partial_update_obj_class_invocation = {
             updated_graphql_obj_name: to_update_sa_obj
         }
 
-        #gc.collect()
         return update_obj_partial_class(**partial_update_obj_class_invocation)
 
     # Decorate resolve_func with the provided hooks class, if we have one.
     final_mutate_func = mutate_func
     update_hook = hooks.get(HookOperation.UPDATE)
     if update_hook:
-        final_mutate_func = update_hook(mutate_func)
+        final_mutate_func = decorate_with_hooks(update_hook, mutate_func)
+
+    # The TRANSACTION hook wraps every mutation, around the operation's own hook.
+    final_mutate_func = decorate_mutate_func_with_transaction_hook(hooks, final_mutate_func)
 
     # Create Definitive Class
     definitive_update_obj_class_items = {"mutate": final_mutate_func}
@@ -645,6 +1329,7 @@ def create_update_obj_mutation_object(
 ################################
 # Object that validates the input arguments of the Create<Model> function
 ################################
+@functools.lru_cache(maxsize=None)
 def create_gql_create_input_object_type_from_sa_class(
         sa_model_class: DeclarativeMeta,
 ) -> type:
@@ -672,6 +1357,7 @@ def create_gql_create_input_object_type_from_sa_class(
 ################################
 # "Create" Mutation's Argument Class
 ################################
+@functools.lru_cache(maxsize=None)
 def create_gql_mutation_create_arguments_class(sa_model_class: DeclarativeMeta) -> type:
     obj_input_class = create_gql_create_input_object_type_from_sa_class(sa_model_class)
 
@@ -689,7 +1375,8 @@ def create_gql_mutation_create_arguments_class(sa_model_class: DeclarativeMeta)
 # create<Model> MAIN FUNCTION
 ################################
 def create_create_obj_mutation_object(
-        sa_model_class: DeclarativeMeta, sa_connection_string, hooks: HookDictType
+        sa_model_class: DeclarativeMeta, sa_connection_string, hooks: HookDictType,
+        autocommit: bool = True
 ) -> type:
     cls_name: str = sa_model_class.__name__
 
@@ -720,10 +1407,14 @@ def create_create_obj_mutation_object(
     # Get class name from the outside and build the parameter name dynamically
     param_name = f"{cls_name.lower()}_data"
 
+    # Columns a create may set (anything else in the input is dropped)
+    insertable_column_names = frozenset(get_column_names_from_sa_model_class(sa_model_class))
+
     # Mutate Function Entry Point
     def mutate_func(root, info, **kwargs):
-        with scoped_db_session_from_sa_connection_string(sa_connection_string) as s:
+        with request_scoped_db_session(info, sa_connection_string, autocommit) as s:
             s: Session
+            raise_if_db_session_rolled_back(s)
 
             # Get the new instance data from kwargs[param_name]
             create_data: dict = kwargs.get(param_name)
@@ -736,35 +1427,36 @@ def create_create_obj_mutation_object(
             new_obj = sa_model_class()
 
             # 2- Add data from the GraphQL Request to the SQLAlchemy Object
-            for k, v in create_data.items():
-                setattr(new_obj, k, v)
+            for k in insertable_column_names & create_data.keys():
+                setattr(new_obj, k, create_data[k])
 
             try:
                 # 3- Add new obj to Session
                 s.add(new_obj)
 
-                # 4- Commit!
-                s.commit()
+                # 4- Commit! (or just flush, leaving the commit to the caller)
+                commit_or_flush_db_session(s, autocommit)
             except DBAPIError as e:
-                s.rollback()
-                s.flush()
-                s.close()
-                raise GraphQLError(e.args)
+                rollback_db_session(s, autocommit)
+                raise GraphQLError(str(e.orig)) from e
 
-            # 5- Attach the newly created object to the return object
-            sa_instance_as_dict = sa_instance_to_dict(new_obj)
+            # 5- Load the committed values (ex.: server defaults) and the relationships the payload selects
+            # while the session is at hand, and attach the newly created object itself to the return object.
+            s.refresh(new_obj)
+            load_payload_sa_relationships(info, new_graphql_obj_name, new_obj)
             partial_create_obj_class_invocation = {
                 new_graphql_obj_name: new_obj
             }
 
-        #gc.collect()
-
         return create_obj_partial_class(**partial_create_obj_class_invocation)
 
     definitive_create_function = mutate_func
     create_hook = hooks.get(HookOperation.CREATE)
     if create_hook:
-        definitive_create_function = create_hook(mutate_func)
+        definitive_create_function = decorate_with_hooks(create_hook, mutate_func)
+
+    # The TRANSACTION hook wraps every mutation, around the operation's own hook.
+    definitive_create_function = decorate_mutate_func_with_transaction_hook(hooks, definitive_create_function)
 
     # Create Definitive Class
     definitive_create_obj_class_items = {"mutate": definitive_create_function}
@@ -784,17 +1476,66 @@ def create_create_obj_mutation_object(
 ################################
 ################################
 
+################################
+# Transient database errors (deadlocks, serialization failures, locked SQLite databases),
+# the ones worth retrying the same statement for
+################################
+TRANSIENT_DB_ERROR_SQLSTATES = frozenset({"40001", "40P01"})  # serialization_failure, deadlock_detected
+TRANSIENT_DB_ERROR_MYSQL_CODES = frozenset({1213})  # ER_LOCK_DEADLOCK
+
+DELETE_RETRY_ATTEMPTS = 4
+DELETE_RETRY_INITIAL_BACKOFF_SECONDS = 0.05
+
+
+def is_transient_db_error(e: DBAPIError) -> bool:
+    if not isinstance(e, OperationalError):
+        return False
+
+    orig = e.orig
+
+    # psycopg2 (pgcode), psycopg 3 (sqlstate)
+    sqlstate = getattr(orig, "pgcode", None) or getattr(orig, "sqlstate", None)
+    if sqlstate in TRANSIENT_DB_ERROR_SQLSTATES:
+        return True
+
+    # MySQL drivers put the error code first
+    if orig is not None and orig.args and orig.args[0] in TRANSIENT_DB_ERROR_MYSQL_CODES:
+        return True
+
+    return "database is locked" in str(orig)
+
+
 ################################
 # "Delete" Mutation's Argument Class
 ################################
+def make_delete_pk_list_arg_name(pk_name: str) -> str:
+    return f"{pk_name}_list"
+
+
 def create_gql_mutation_delete_arguments_class(sa_model_class: DeclarativeMeta) -> type:
     arg_class_items = {}
 
-    primary_keys = inspect(sa_model_class).primary_key
-
-    for pk_obj in primary_keys:
+    # Each pk argument gets its column's GraphQL type (integer pks as Int, not ID), so graphene
+    # already hands over values of the right type: nothing to cast in the mutation.
+    for pk_obj in inspect(sa_model_class).primary_key:
         pk_name = pk_obj.name
-        arg_class_items[pk_name] = graphene.Int(required=True)
+        arg_class_items[pk_name] = get_graphql_field_type_for_sa_column(pk_obj, mask_ID_to_Int)(required=True)
+
+    arguments_class = type("Arguments", (), arg_class_items)
+
+    return arguments_class
+
+
+def create_gql_mutation_delete_list_arguments_class(sa_model_class: DeclarativeMeta) -> type:
+    # Single primary key models only: delete many objects at once, by a list of pks.
+    pk_obj = inspect(sa_model_class).primary_key[0]
+    pk_graphql_type = get_graphql_field_type_for_sa_column(pk_obj, mask_ID_to_Int)
+
+    arg_class_items = {
+        make_delete_pk_list_arg_name(pk_obj.name): graphene.List(
+            graphene.NonNull(pk_graphql_type), required=True, description="Primary keys of the objects to delete"
+        )
+    }
 
     arguments_class = type("Arguments", (), arg_class_items)
 
@@ -805,21 +1546,42 @@ def create_gql_mutation_delete_arguments_class(sa_model_class: DeclarativeMeta)
 # delete<Model> MAIN FUNCTION
 ################################
 def create_delete_obj_mutation_object(
-        sa_model_class: DeclarativeMeta, sa_connection_string, hooks: HookDictType
+        sa_model_class: DeclarativeMeta, sa_connection_string, hooks: HookDictType,
+        autocommit: bool = True, by_pk_list: bool = False
 ) -> type:
-    # Class Name
-    cls_name: str = sa_model_class.__name__
+    """Delete<Model> (by primary key), or with by_pk_list=True, Delete<Model>List (by a list of primary keys,
+    single primary key models only)"""
+    delete_mutation_registry = __SCHEMAGEN_delete_mutation_registry
+
+    # hooks is a dict (unhashable), so key on a snapshot of its items.
+    delete_mutation_key = (sa_model_class, sa_connection_string, frozenset(hooks.items()), autocommit, by_pk_list)
+    if delete_mutation_key not in delete_mutation_registry:
+        delete_mutation_registry[delete_mutation_key] = build_delete_obj_mutation_object(
+            sa_model_class, sa_connection_string, hooks, autocommit, by_pk_list
+        )
+
+    return delete_mutation_registry[delete_mutation_key]
 
-    ################################
-    # create a partial class to be able to use it inside the mutate() function ;-)
-    ################################
 
-    # Argument name - the count of deleted items (1 or 0)
-    deleted_count_arg_name = "deleted_count"
+################################
+# create a partial class to be able to use it inside the mutate() function ;-)
+# (it's only the mutation's "shape": arguments and output, so it's built once per model and
+# shared by every Delete<Model> subclass, whatever their connection string/hooks)
+################################
+
+# Argument name - the count of deleted items
+deleted_count_arg_name = "deleted_count"
+
 
+@functools.lru_cache(maxsize=None)
+def create_delete_obj_mutation_partial_class(sa_model_class: DeclarativeMeta, by_pk_list: bool = False) -> type:
     delete_obj_partial_class_items = {
         # Update Mutation Arguments
-        "Arguments": create_gql_mutation_delete_arguments_class(sa_model_class),
+        "Arguments": (
+            create_gql_mutation_delete_list_arguments_class(sa_model_class)
+            if by_pk_list
+            else create_gql_mutation_delete_arguments_class(sa_model_class)
+        ),
         # The return value of the update mutation query (the same object)
         deleted_count_arg_name: graphene.Field(graphene.Int),
         # this needs to exist or else the class cannot be created, it needs this item to exist.
@@ -827,58 +1589,124 @@ def create_delete_obj_mutation_object(
     }
 
     # Create Partial CreateObj Class
-    delete_obj_partial_class = type(
-        f"PartialDelete{cls_name}", (graphene.Mutation,), delete_obj_partial_class_items
+    return type(
+        f"PartialDelete{sa_model_class.__name__}{'List' if by_pk_list else ''}",
+        (graphene.Mutation,),
+        delete_obj_partial_class_items,
     )
 
-    # primary key name
-    pk_names = [x.name for x in inspect(sa_model_class).primary_key]
+
+def expunge_deleted_sa_objs(s: Session, sa_model_mapper: Mapper, deleted_pk_identities: List[tuple]):
+    # Objects the session loaded before the bulk DELETE would otherwise stay in its identity map,
+    # and be handed out again (ex.: by Query.get()) for rows that no longer exist.
+    identity_map = s.identity_map
+    if not len(identity_map):
+        return
+
+    for pk_identity in deleted_pk_identities:
+        deleted_sa_obj = identity_map.get(sa_model_mapper.identity_key_from_primary_key(pk_identity))
+        if deleted_sa_obj is not None:
+            s.expunge(deleted_sa_obj)
+
+
+def build_delete_obj_mutation_object(
+        sa_model_class: DeclarativeMeta, sa_connection_string, hooks: HookDictType,
+        autocommit: bool = True, by_pk_list: bool = False
+) -> type:
+    # Class Name
+    cls_name: str = f"{sa_model_class.__name__}List" if by_pk_list else sa_model_class.__name__
+
+    delete_obj_partial_class = create_delete_obj_mutation_partial_class(sa_model_class, by_pk_list)
+
+    # primary key names and their (model table's) columns, looked up once
+    sa_model_mapper: Mapper = inspect(sa_model_class)
+    sa_model_table: Table = sa_model_mapper.local_table
+    pk_cols = [(x.name, sa_model_table.c.get(x.name, x)) for x in sa_model_mapper.primary_key]
+
+    # single primary key models can delete by a list of pks too (Delete<Model>List)
+    single_pk_name = pk_cols[0][0] if len(pk_cols) == 1 else None
+    pk_list_arg_name = make_delete_pk_list_arg_name(single_pk_name) if by_pk_list else None
+
+    # The DELETE statement itself, built once with bound pks: "pk IN (...)" (an expanding bindparam, for any
+    # number of pks) for single primary keys, "pk1 = ? AND pk2 = ?" for composite ones.
+    # (a Core statement: a bulk DELETE, the session never sees the deleted objects go, so the ones it
+    # already holds are expunged afterwards, see expunge_deleted_sa_objs.)
+    if single_pk_name:
+        delete_stmt = sqlalchemy.delete(sa_model_table).where(
+            pk_cols[0][1].in_(bindparam("pk_ids", expanding=True))
+        )
+    else:
+        delete_stmt = sqlalchemy.delete(sa_model_table).where(
+            sqlalchemy.and_(*[pk_col == bindparam(f"pk_{pk_name}") for pk_name, pk_col in pk_cols])
+        )
 
     # Mutate Function Entry Point
     def mutate_func(root, info, **kwargs):
 
-        pk_dict = {}
-        for pk_name in pk_names:
-            # Get the new instance data from kwargs[param_name]
-            pk_dict[pk_name] = kwargs.get(pk_name)
-
-        with scoped_db_session_from_sa_connection_string(sa_connection_string) as s:
+        # Find the object(s) by their primary key(s).
+        if single_pk_name:
+            # every requested pk, in a single "pk IN (...)"
+            if pk_list_arg_name:
+                pk_ids = list(kwargs.get(pk_list_arg_name) or ())
+            else:
+                pk_ids = [kwargs[single_pk_name]] if kwargs.get(single_pk_name) is not None else []
+
+            delete_params = {"pk_ids": pk_ids}
+            deleted_pk_identities = [(pk_id,) for pk_id in pk_ids]
+        else:
+            pk_ids = [kwargs.get(pk_name) for pk_name, pk_col in pk_cols]
+            if None in pk_ids:
+                pk_ids = []
+
+            delete_params = {f"pk_{pk_name}": pk_id for (pk_name, pk_col), pk_id in zip(pk_cols, pk_ids)}
+            deleted_pk_identities = [tuple(pk_ids)]
+
+        # No primary keys (ex.: a hook stripped them), nothing to delete: don't even get to a DELETE
+        # statement, which without its WHERE would wipe the whole table.
+        if not pk_ids:
+            return delete_obj_partial_class(**{deleted_count_arg_name: 0})
+
+        with request_scoped_db_session(info, sa_connection_string, autocommit) as s:
             s: Session
+            raise_if_db_session_rolled_back(s)
 
             ###################
             # DELETE DATA
             ###################
 
-            # Find the object and flag it for deletion in the next commit.
-            deleted_base_query = s.query(sa_model_class)
-            for pk_name, pk_id in pk_dict.items():
-                deleted_base_query = deleted_base_query.filter(
-                    getattr(sa_model_class, pk_name) == int(pk_id)
-                )
-
             # Delete and return how many objects were deleted.
-            try:
-                deleted_count = deleted_base_query.delete()
-                s.commit()
-            except DBAPIError as e:
-                s.rollback()
-                s.flush()
-                s.close()
-                raise GraphQLError(e.args)
+            retry_backoff_seconds = DELETE_RETRY_INITIAL_BACKOFF_SECONDS
+            for attempt in range(1, DELETE_RETRY_ATTEMPTS + 1):
+                try:
+                    deleted_count = s.execute(delete_stmt, delete_params).rowcount
+                    commit_or_flush_db_session(s, autocommit)
+                    expunge_deleted_sa_objs(s, sa_model_mapper, deleted_pk_identities)
+                    break
+                except DBAPIError as e:
+                    rollback_db_session(s, autocommit)
+
+                    # Only retry a transaction that holds nothing but this DELETE: without autocommit,
+                    # the rollback also undid whatever the request's other mutations flushed.
+                    if not autocommit or attempt == DELETE_RETRY_ATTEMPTS or not is_transient_db_error(e):
+                        raise GraphQLError(str(e.orig)) from e
+
+                    time.sleep(retry_backoff_seconds)
+                    retry_backoff_seconds *= 2
 
         # Return the count of deleted objects as 'result'
         partial_delete_obj_class_invocation = {
-            deleted_count_arg_name: int(deleted_count)
+            deleted_count_arg_name: deleted_count
         }
 
-        #gc.collect()
-
         return delete_obj_partial_class(**partial_delete_obj_class_invocation)
 
     definitive_delete_func = mutate_func
     delete_hook = hooks.get(HookOperation.DELETE)
     if delete_hook:
-        definitive_delete_func = delete_hook(mutate_func)
+        definitive_delete_func = decorate_with_hooks(delete_hook, mutate_func)
+
+    # The TRANSACTION hook wraps every mutation, around the operation's own hook.
+    definitive_delete_func = decorate_mutate_func_with_transaction_hook(hooks, definitive_delete_func)
 
     # Create Definitive Class
     definitive_delete_obj_class_items = {"mutate": definitive_delete_func}
@@ -1,28 +1,56 @@
-from decimal import Decimal
+import sys
+from dataclasses import dataclass
+from decimal import Decimal, InvalidOperation
 
 
+# eq=False: __eq__/__hash__ are written out below, so Money subclasses still compare equal to Money.
+@dataclass(frozen=True, eq=False)
 class Money(object):
     """Class to Represent a Monetary Value"""
 
-    def __init__(self, currency: str, value: Decimal):
-        self.currency = currency
-        self.value = value
+    # (dataclass(slots=True) is Python 3.10+, so they're spelled out)
+    __slots__ = ("currency", "value", "_composite_values")
 
-    def __composite_values__(self):
-        return self.currency, self.value
+    currency: str
+    value: Decimal
 
-    def __repr__(self):
-        return "MoneyComposite(curr=%r, value=%r)" % (self.currency, self.value)
+    def __post_init__(self):
+        # There's only a handful of currency codes: share one string per code, so comparing
+        # them is mostly an identity check and millions of instances don't each hold a copy.
+        # (exact str only: sys.intern() refuses str subclasses, ex.: a str-based Enum member)
+        if type(self.currency) is str:
+            object.__setattr__(self, "currency", sys.intern(self.currency))
+
+        # Keep value a Decimal (ints, strings, floats by their shortest repr), so comparing and hashing
+        # never mixes types. (None stays None: that's what SQLAlchemy hands over for NULL columns)
+        if self.value is not None and not isinstance(self.value, Decimal):
+            try:
+                value = Decimal(str(self.value)) if isinstance(self.value, float) else Decimal(self.value)
+            except (InvalidOperation, TypeError, ValueError) as e:
+                raise ValueError(f"Money value must be a number, got {self.value!r}") from e
+            object.__setattr__(self, "value", value)
+
+        # SQLAlchemy asks for the composite values on every flush, build them once.
+        object.__setattr__(self, "_composite_values", (self.currency, self.value))
+
+    def __composite_values__(self):
+        return self._composite_values
 
     def __eq__(self, other):
-        return (
-            isinstance(other, Money)
-            and other.currency == self.currency
-            and other.value == self.value
-        )
+        return isinstance(other, Money) and other._composite_values == self._composite_values
+
+    def __hash__(self):
+        return hash(self._composite_values)
 
-    def __ne__(self, other):
-        return not self.__eq__(other)
+    # frozen + __slots__ can't go through the default pickling (it setattr()s the slots back)
+    def __reduce__(self):
+        return type(self), self._composite_values
+
+    def __repr__(self):
+        return "MoneyComposite(curr=%r, value=%r)" % self._composite_values
 
     def __str__(self):
-        return f"{self.currency if self.currency else ''} {self.value if self.value else ''}".strip()
+        currency, value = self._composite_values
+        if currency and value:
+            return f"{currency} {value}"
+        return f"{currency if currency else ''} {value if value else ''}".strip()
@@ -0,0 +1,87 @@
+import pytest
+from sqlalchemy import Column, Integer, String, ForeignKey, create_engine, event
+from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import relationship, validates
+
+from sqlalchemy_graphql_schemagen.graphql.schemagen import SQLAlchemyGraphQLSchemaGenerator
+from sqlalchemy_graphql_schemagen.graphql.schemagen.utilities import get_sessionmaker_from_sa_connection_string
+
+Base = declarative_base()
+
+
+class Author(Base):
+    __tablename__ = "authors"
+    id = Column(Integer, primary_key=True)
+    name = Column(String(50), nullable=False)
+    books = relationship("Book", back_populates="author")
+
+
+class Book(Base):
+    __tablename__ = "books"
+    id = Column(Integer, primary_key=True)
+    title = Column(String(50))
+    author_id = Column(Integer, ForeignKey("authors.id"))
+    author = relationship("Author", back_populates="books")
+    reviews = relationship("Review", back_populates="book")
+
+
+class Review(Base):
+    __tablename__ = "reviews"
+    id = Column(Integer, primary_key=True)
+    text = Column(String(200))
+    book_id = Column(Integer, ForeignKey("books.id"))
+    book = relationship("Book", back_populates="reviews")
+
+
+class BookTag(Base):
+    __tablename__ = "book_tags"
+    book_id = Column(Integer, ForeignKey("books.id"), primary_key=True)
+    tag_name = Column(String(20), primary_key=True)
+
+
+class Publisher(Base):
+    __tablename__ = "publishers"
+    id = Column(Integer, primary_key=True)
+    name = Column(String(50))
+
+    @validates("name")
+    def validate_name(self, _key, name):
+        return name.strip()
+
+
+@pytest.fixture
+def sa_connection_string(tmp_path):
+    # one database per test, so the cached engines/sessionmakers never share data between tests
+    sa_connection_string = f"sqlite:///{tmp_path / 'test.db'}"
+    Base.metadata.create_all(create_engine(sa_connection_string))
+    return sa_connection_string
+
+
+@pytest.fixture
+def make_schema(sa_connection_string):
+    def make_schema(declarative_base=Base, **generator_args):
+        return SQLAlchemyGraphQLSchemaGenerator(
+            "Test", declarative_base, sa_connection_string=sa_connection_string, **generator_args
+        ).get_graphene_schema()
+
+    return make_schema
+
+
+@pytest.fixture
+def db_statements(sa_connection_string):
+    """The SQL statements executed against the test database, in order."""
+    statements = []
+    engine = get_sessionmaker_from_sa_connection_string(sa_connection_string).kw["bind"]
+
+    def record_statement(_conn, _cursor, statement, *_args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record_statement)
+    yield statements
+    event.remove(engine, "before_cursor_execute", record_statement)
+
+
+def execute(schema, request_string, **execute_args):
+    result = schema.execute(request_string, **execute_args)
+    assert not result.errors, result.errors
+    return result.data
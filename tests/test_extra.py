@@ -0,0 +1,58 @@
+import os
+import subprocess
+import sys
+import threading
+
+import graphene
+
+from sqlalchemy_graphql_schemagen.graphql.schemagen.extra import (
+    FilterOp,
+    SCALAR_FILTER_OP_GRAPHQL_TYPES,
+    create_or_get_graphql_filter_op_type_class,
+)
+
+
+def test_filter_op_class_is_built_once_per_type():
+    class Color(graphene.Enum):
+        RED = 1
+
+    assert create_or_get_graphql_filter_op_type_class(Color) is FilterOp[Color]
+    assert FilterOp[Color].__name__ == "ColorFilterOp"
+
+
+def test_concurrent_misses_get_the_same_filter_op_class():
+    class Shade(graphene.Enum):
+        DARK = 1
+
+    thread_count = 8
+    barrier = threading.Barrier(thread_count)
+    filter_op_classes = []
+
+    def build():
+        barrier.wait()
+        filter_op_classes.append(create_or_get_graphql_filter_op_type_class(Shade))
+
+    threads = [threading.Thread(target=build) for _ in range(thread_count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(filter_op_classes) == thread_count
+    assert len(set(map(id, filter_op_classes))) == 1
+
+
+def filter_op_registry_size_at_import(**environ):
+    code = (
+        "from sqlalchemy_graphql_schemagen.graphql.schemagen import extra; "
+        "print(len(getattr(extra, '__SCHEMAGEN_filter_op_type_class_registry')))"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], env={**os.environ, **environ}, check=True, capture_output=True, text=True
+    ).stdout
+    return int(output)
+
+
+def test_scalar_filter_ops_are_preregistered_at_import():
+    assert filter_op_registry_size_at_import() == len(SCALAR_FILTER_OP_GRAPHQL_TYPES)
+    assert filter_op_registry_size_at_import(SCHEMAGEN_PREREGISTER_SCALAR_FILTER_OPS="0") == 0
@@ -0,0 +1,59 @@
+import pytest
+
+from sqlalchemy_graphql_schemagen.graphql.schemagen.utilities import (
+    create_db_session_from_sa_connection_string,
+    make_contains_like_pattern,
+)
+
+from .conftest import Author, Book, execute
+
+
+@pytest.fixture
+def books(sa_connection_string):
+    s = create_db_session_from_sa_connection_string(sa_connection_string)
+    s.add_all([Author(id=author_id, name=f"A{author_id}") for author_id in (1, 2, 10)])
+    s.add_all([
+        Book(id=1, title="x%y_z", author_id=1),
+        Book(id=2, title="xyz", author_id=2),
+        Book(id=3, title="Ten", author_id=10),
+    ])
+    s.commit()
+    s.close()
+
+
+def filtered_book_titles(schema, filters, variable_definitions="", **execute_args):
+    data = execute(schema, "query %s { books(filters: [%s]) { title } }" % (variable_definitions, filters),
+                   **execute_args)
+    return sorted(book["title"] for book in data["books"])
+
+
+def test_like_escapes_wildcards(make_schema, books):
+    schema = make_schema()
+    assert filtered_book_titles(schema, '{title: {op: LIKE, v: "%y"}}') == ["x%y_z"]
+    assert filtered_book_titles(schema, '{title: {op: LIKE, v: "_"}}') == ["x%y_z"]
+    assert filtered_book_titles(schema, '{title: {op: NOTLIKE, v: "_"}}') == ["Ten", "xyz"]
+    assert filtered_book_titles(schema, '{title: {op: ILIKE, v: "TEN"}}') == ["Ten"]
+
+
+def test_like_on_a_non_string_value(make_schema, books):
+    # authorId is an Int column, so its FilterOp's v is an Int
+    schema = make_schema()
+    assert filtered_book_titles(schema, "{authorId: {op: LIKE, v: 1}}") == ["Ten", "x%y_z"]
+    assert filtered_book_titles(schema, "{authorId: {op: NOTLIKE, v: 1}}") == ["xyz"]
+
+
+def test_like_without_a_value_matches_any_text(make_schema, books):
+    schema = make_schema()
+    every_title = ["Ten", "x%y_z", "xyz"]
+    assert filtered_book_titles(
+        schema, "{title: {op: LIKE, v: $v}}", "($v: String)", variable_values={"v": None}
+    ) == every_title
+    assert filtered_book_titles(schema, "{title: {op: ILIKE}}") == every_title
+    assert filtered_book_titles(schema, "{title: {op: NOTLIKE}}") == []
+
+
+def test_make_contains_like_pattern():
+    assert make_contains_like_pattern("a%b_c\\") == "%a\\%b\\_c\\\\%"
+    assert make_contains_like_pattern(1) == "%1%"
+    assert make_contains_like_pattern(True) == "%True%"
+    assert make_contains_like_pattern(None) == "%%"
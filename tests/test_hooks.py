@@ -0,0 +1,77 @@
+from sqlalchemy_graphql_schemagen.graphql.schemagen.hooks import (
+    SchemaGenHooksBase,
+    PreHookResult,
+    HookOperation,
+    decorate_with_hooks,
+)
+
+from .conftest import Base, execute
+
+
+def make_static_hooks_class(post_retval):
+    class StaticHooks(SchemaGenHooksBase):
+        @staticmethod
+        def pre(parent, info, **kwargs):
+            return PreHookResult.CONTINUE
+
+        @staticmethod
+        def post(parent, info, func_retval, **kwargs):
+            return post_retval
+
+    return StaticHooks
+
+
+def test_hooks_class_with_custom_init_and_call_is_instantiated(make_schema):
+    calls = []
+
+    class RecordingHooks(SchemaGenHooksBase):
+        @staticmethod
+        def pre(parent, info, **kwargs):
+            return PreHookResult.CONTINUE
+
+        @staticmethod
+        def post(parent, info, func_retval, **kwargs):
+            pass
+
+        def __init__(self, func_to_be_decorated):
+            calls.append("init")
+            super().__init__(func_to_be_decorated)
+
+        def __call__(self, *args, **kwargs):
+            calls.append("call")
+            return super().__call__(*args, **kwargs)
+
+    schema = make_schema(op_hooks={HookOperation.READ: RecordingHooks})
+
+    # one READ decorated resolver per model
+    model_count = len(Base.metadata.tables)
+    assert calls == ["init"] * model_count
+
+    execute(schema, "{ authors { name } }")
+    assert calls == ["init"] * model_count + ["call"]
+
+
+def test_hooks_class_with_instance_methods_is_instantiated():
+    class InstanceHooks(SchemaGenHooksBase):
+        suffix = "!"
+
+        def pre(self, parent, info, **kwargs):
+            return PreHookResult.CONTINUE
+
+        def post(self, parent, info, func_retval, **kwargs):
+            return func_retval + self.suffix
+
+    hooked_func = decorate_with_hooks(InstanceHooks, lambda parent, info: "hooked")
+    assert isinstance(hooked_func, InstanceHooks)
+    assert hooked_func(None, None) == "hooked!"
+
+
+def test_static_hooks_class_post_retval_substitutes_the_result():
+    hooked_func = decorate_with_hooks(make_static_hooks_class(["post"]), lambda parent, info: ["func"])
+    assert hooked_func(None, None) == ["post"]
+
+
+def test_static_hooks_class_falsy_post_retval_keeps_the_result():
+    for post_retval in (None, [], 0, ""):
+        hooked_func = decorate_with_hooks(make_static_hooks_class(post_retval), lambda parent, info: ["func"])
+        assert hooked_func(None, None) == ["func"]
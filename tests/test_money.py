@@ -0,0 +1,45 @@
+from decimal import Decimal
+from enum import Enum
+
+import pytest
+
+from sqlalchemy_graphql_schemagen.sqlalchemy.compositetypes import Money
+
+
+class Currency(str, Enum):
+    USD = "USD"
+
+
+def test_money_currency_codes_are_interned():
+    assert Money("".join(["U", "SD"]), Decimal("1")).currency is Money("USD", Decimal("2")).currency
+
+
+def test_money_accepts_str_subclass_currency():
+    money = Money(Currency.USD, Decimal("1.00"))
+    assert money.currency is Currency.USD
+    assert money == Money("USD", Decimal("1.00"))
+
+
+def test_money_compares_equal_to_subclasses():
+    class TaggedMoney(Money):
+        __slots__ = ()
+
+    money = Money("USD", Decimal("1.00"))
+    assert money == TaggedMoney("USD", Decimal("1.00"))
+    assert TaggedMoney("USD", Decimal("1.00")) == money
+    assert money != Money("EUR", Decimal("1.00"))
+    assert money != ("USD", Decimal("1.00"))
+    assert hash(money) == hash(TaggedMoney("USD", Decimal("1.00")))
+
+
+def test_money_normalizes_value_to_decimal():
+    assert Money("USD", 1).value == Decimal("1")
+    assert Money("USD", "1.50").value == Decimal("1.50")
+    assert Money("USD", 0.1).value == Decimal("0.1")
+    assert Money("USD", None).value is None
+
+
+def test_money_rejects_non_numeric_value():
+    for value in ("abc", object(), [1]):
+        with pytest.raises(ValueError, match="Money value must be a number"):
+            Money("USD", value)
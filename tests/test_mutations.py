@@ -0,0 +1,370 @@
+import sqlite3
+from datetime import datetime
+
+import pytest
+from sqlalchemy import Column, Integer, String, DateTime, event, inspect
+from sqlalchemy.exc import IntegrityError, OperationalError
+from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import Session, validates
+
+from sqlalchemy_graphql_schemagen.graphql.schemagen import utilities
+from sqlalchemy_graphql_schemagen.graphql.schemagen.utilities import (
+    REQUEST_CONTEXT_DB_SESSIONS_KEY,
+    SchemaGenTransactionException,
+    close_request_db_sessions,
+    commit_request_db_sessions,
+    create_db_session_from_sa_connection_string,
+    is_transient_db_error,
+    open_request_db_sessions,
+    request_db_sessions,
+    sa_mapper_supports_update_returning,
+)
+
+from .conftest import Author, Book, BookTag, Publisher, execute
+
+
+def add_rows(sa_connection_string, *sa_objs):
+    s = create_db_session_from_sa_connection_string(sa_connection_string)
+    s.add_all(sa_objs)
+    s.commit()
+    s.close()
+
+
+def author_names(schema):
+    return sorted(a["name"] for a in execute(schema, "{ authors { name } }")["authors"])
+
+
+def test_delete_expunges_the_deleted_objects_from_the_session(make_schema, sa_connection_string):
+    add_rows(sa_connection_string, Author(id=1, name="A"), Author(id=2, name="B"))
+    schema = make_schema(autocommit=False)
+
+    with request_db_sessions({}) as context:
+        execute(schema, "{ authors { name } }", context_value=context)
+        s = context[REQUEST_CONTEXT_DB_SESSIONS_KEY][sa_connection_string]
+        assert s.query(Author).get(1) is not None
+
+        data = execute(schema, "mutation { deleteAuthor(id: 1) { deletedCount } }", context_value=context)
+        assert data["deleteAuthor"]["deletedCount"] == 1
+        assert s.query(Author).get(1) is None
+        assert s.query(Author).get(2).name == "B"
+
+
+def test_delete_by_composite_primary_key(make_schema, sa_connection_string):
+    add_rows(
+        sa_connection_string,
+        Author(id=1, name="A"),
+        Book(id=1, title="T", author_id=1),
+        BookTag(book_id=1, tag_name="x"),
+        BookTag(book_id=1, tag_name="y"),
+    )
+    schema = make_schema()
+
+    data = execute(schema, 'mutation { deleteBooktag(bookId: 1, tagName: "x") { deletedCount } }')
+    assert data["deleteBooktag"]["deletedCount"] == 1
+    assert execute(schema, "{ bookTags { tagName } }")["bookTags"] == [{"tagName": "y"}]
+
+
+def test_delete_list_mutation_deletes_every_requested_pk(make_schema, sa_connection_string, db_statements):
+    add_rows(sa_connection_string, Author(id=1, name="A"), Author(id=2, name="B"), Author(id=3, name="C"))
+    schema = make_schema()
+
+    data = execute(schema, "mutation { deleteAuthorList(idList: [1, 3, 4]) { deletedCount } }")
+    assert data["deleteAuthorList"]["deletedCount"] == 2
+    assert [st for st in db_statements if st.startswith("DELETE")] == [
+        "DELETE FROM authors WHERE authors.id IN (?, ?, ?)"
+    ]
+    assert author_names(schema) == ["B"]
+
+    data = execute(schema, "mutation { deleteAuthorList(idList: []) { deletedCount } }")
+    assert data["deleteAuthorList"]["deletedCount"] == 0
+    assert author_names(schema) == ["B"]
+
+
+def test_delete_mutation_keeps_a_required_pk_argument(make_schema):
+    sdl = str(make_schema())
+    assert "deleteAuthor(id: Int!): DeleteAuthor" in sdl
+    assert "deleteAuthorList(idList: [Int!]!): DeleteAuthorList" in sdl
+    assert "deleteBooktag(bookId: Int!, tagName: String!): DeleteBookTag" in sdl
+    assert "deleteBooktagList" not in sdl
+
+
+class TestUpdateReturning:
+    """UPDATE ... RETURNING (SQLAlchemy < 2.0 won't compile it for SQLite, so it borrows PostgreSQL's clause)"""
+
+    @pytest.fixture
+    def returning_updates(self, monkeypatch):
+        if sqlite3.sqlite_version_info < (3, 35):
+            pytest.skip("SQLite supports RETURNING since 3.35")
+
+        from sqlalchemy.dialects.postgresql.base import PGCompiler
+        from sqlalchemy.dialects.sqlite.base import SQLiteCompiler
+
+        monkeypatch.setattr(SQLiteCompiler, "returning_clause", PGCompiler.returning_clause, raising=False)
+        monkeypatch.setattr(utilities, "sa_dialect_supports_update_returning", lambda _dialect: True)
+
+        returning_updates = []
+        update_sa_obj_by_pk_id_returning = utilities.update_sa_obj_by_pk_id_returning
+
+        def recording_update_sa_obj_by_pk_id_returning(sa_class, pk_name, pk_id, update_values, s, autocommit=True):
+            returning_updates.append((sa_class, pk_id, update_values))
+            return update_sa_obj_by_pk_id_returning(sa_class, pk_name, pk_id, update_values, s, autocommit)
+
+        monkeypatch.setattr(utilities, "update_sa_obj_by_pk_id_returning", recording_update_sa_obj_by_pk_id_returning)
+        return returning_updates
+
+    def test_plain_model_updates_with_returning(self, make_schema, sa_connection_string, returning_updates,
+                                                db_statements):
+        add_rows(sa_connection_string, Author(id=1, name="A"))
+        schema = make_schema()
+        db_statements.clear()
+
+        data = execute(schema, 'mutation { updateAuthor(authorData: {id: 1, name: "Z"}) { Author { id name } } }')
+        assert data["updateAuthor"]["Author"] == {"id": "1", "name": "Z"}
+        # (the update input's pk is an ID, so it comes in as a string)
+        assert returning_updates == [(Author, "1", {"name": "Z"})]
+        # the RETURNING row is the updated object, no SELECT before or after the UPDATE
+        assert [statement.split()[0] for statement in db_statements] == ["UPDATE"]
+        assert "RETURNING" in db_statements[0]
+        assert author_names(schema) == ["Z"]
+
+    def test_returning_update_without_autocommit(self, make_schema, sa_connection_string, returning_updates):
+        add_rows(sa_connection_string, Author(id=1, name="A"))
+        schema = make_schema(autocommit=False)
+
+        context = {}
+        open_request_db_sessions(context)
+        data = execute(schema, 'mutation { updateAuthor(authorData: {id: 1, name: "Z"}) { Author { name } } }',
+                       context_value=context)
+        assert data["updateAuthor"]["Author"]["name"] == "Z"
+        assert len(returning_updates) == 1
+        assert author_names(schema) == ["A"]
+
+        commit_request_db_sessions(context)
+        close_request_db_sessions(context)
+        assert author_names(schema) == ["Z"]
+
+    def test_non_integer_primary_key(self, sa_connection_string, returning_updates):
+        CodeBase = declarative_base()
+
+        class Code(CodeBase):
+            __tablename__ = "codes"
+            code = Column(String(10), primary_key=True)
+            name = Column(String(50))
+
+        s = create_db_session_from_sa_connection_string(sa_connection_string)
+        CodeBase.metadata.create_all(s.get_bind())
+        s.add(Code(code="x1", name="A"))
+        s.commit()
+
+        updated_code = utilities.update_sa_obj_by_pk_id_returning(Code, "code", "x1", {"name": "Z"}, s)
+        assert (updated_code.code, updated_code.name) == ("x1", "Z")
+        assert updated_code in s and not s.dirty
+        s.close()
+
+    def test_model_with_validators_goes_through_the_orm(self, make_schema, sa_connection_string, returning_updates):
+        add_rows(sa_connection_string, Publisher(id=1, name="P"))
+        schema = make_schema()
+
+        data = execute(schema, 'mutation { updatePublisher(publisherData: {id: 1, name: " Q "}) { Publisher { name } } }')
+        assert data["updatePublisher"]["Publisher"]["name"] == "Q"
+        assert returning_updates == []
+
+
+def test_sa_mapper_supports_update_returning():
+    ReturningBase = declarative_base()
+
+    class Plain(ReturningBase):
+        __tablename__ = "plain"
+        id = Column(Integer, primary_key=True)
+        name = Column(String(50))
+
+    class Validated(ReturningBase):
+        __tablename__ = "validated"
+        id = Column(Integer, primary_key=True)
+        name = Column(String(50))
+
+        @validates("name")
+        def validate_name(self, _key, name):
+            return name
+
+    class Versioned(ReturningBase):
+        __tablename__ = "versioned"
+        id = Column(Integer, primary_key=True)
+        version = Column(Integer, nullable=False)
+        __mapper_args__ = {"version_id_col": version}
+
+    class Stamped(ReturningBase):
+        __tablename__ = "stamped"
+        id = Column(Integer, primary_key=True)
+        updated_at = Column(DateTime, onupdate=datetime.utcnow)
+
+    class Parent(ReturningBase):
+        __tablename__ = "parent"
+        id = Column(Integer, primary_key=True)
+        kind = Column(String(20))
+        __mapper_args__ = {"polymorphic_on": kind, "polymorphic_identity": "parent"}
+
+    class Child(Parent):
+        __mapper_args__ = {"polymorphic_identity": "child"}
+
+    class MapperEvents(ReturningBase):
+        __tablename__ = "mapper_events"
+        id = Column(Integer, primary_key=True)
+
+    class AttributeEvents(ReturningBase):
+        __tablename__ = "attribute_events"
+        id = Column(Integer, primary_key=True)
+        name = Column(String(50))
+
+    event.listen(MapperEvents, "before_update", lambda *_args: None)
+    event.listen(AttributeEvents.name, "set", lambda *_args: None)
+
+    assert sa_mapper_supports_update_returning(inspect(Plain))
+    for sa_model_class in (Validated, Versioned, Stamped, Parent, Child, MapperEvents, AttributeEvents):
+        assert not sa_mapper_supports_update_returning(inspect(sa_model_class)), sa_model_class
+
+
+class TestRequestTransaction:
+    """autocommit=False: the request's mutations only flush, and commit_request_db_sessions() commits them"""
+
+    MUTATIONS = """mutation {
+        a: createAuthor(authorData: {id: 10, name: "A"}) { Author { id } }
+        b: createAuthor(authorData: {id: %s, name: "B"}) { Author { id } }
+        c: createAuthor(authorData: {id: 30, name: "C"}) { Author { id } }
+    }"""
+
+    def test_request_commits_once_at_the_end(self, make_schema):
+        schema = make_schema(autocommit=False)
+
+        context = {}
+        open_request_db_sessions(context)
+        execute(schema, self.MUTATIONS % 20, context_value=context)
+        assert author_names(schema) == []
+
+        commit_request_db_sessions(context)
+        close_request_db_sessions(context)
+        assert author_names(schema) == ["A", "B", "C"]
+
+    @pytest.mark.parametrize("context", [None, {}])
+    def test_mutations_without_request_db_sessions_refuse_to_run(self, make_schema, context):
+        schema = make_schema(autocommit=False)
+
+        # nothing would commit them, so they don't report a success that's rolled back right after
+        result = schema.execute(self.MUTATIONS % 20, context_value=context)
+        assert result.data == {"a": None, "b": None, "c": None}
+        assert "needs the request's db sessions" in result.errors[0].message
+        assert author_names(schema) == []
+
+    def test_failed_mutation_rolls_back_the_whole_request(self, make_schema):
+        schema = make_schema(autocommit=False)
+
+        # b reuses a's primary key
+        context = {}
+        open_request_db_sessions(context)
+        result = schema.execute(self.MUTATIONS % 10, context_value=context)
+        assert result.data["a"] is not None
+        assert result.data["b"] is None and result.data["c"] is None
+        assert "UNIQUE constraint failed" in result.errors[0].message
+        assert "earlier mutation of this request failed" in result.errors[1].message
+
+        # a's insert went away with b's rollback, so nothing can be committed
+        with pytest.raises(SchemaGenTransactionException):
+            commit_request_db_sessions(context)
+        close_request_db_sessions(context)
+        assert author_names(schema) == []
+
+        # a new request starts over
+        context = {}
+        open_request_db_sessions(context)
+        execute(schema, self.MUTATIONS % 20, context_value=context)
+        commit_request_db_sessions(context)
+        close_request_db_sessions(context)
+        assert author_names(schema) == ["A", "B", "C"]
+
+    def test_autocommit_keeps_the_mutations_before_a_failed_one(self, make_schema):
+        schema = make_schema()
+
+        with request_db_sessions({}) as context:
+            result = schema.execute(self.MUTATIONS % 10, context_value=context)
+        assert len(result.errors) == 1
+        assert author_names(schema) == ["A", "C"]
+
+
+class TestDeleteRetry:
+    """Transient errors (deadlocks, serialization failures, a locked SQLite database) retry the DELETE"""
+
+    @pytest.fixture
+    def failing_deletes(self, monkeypatch):
+        # how many DELETEs to fail, and the backoff sleeps in between
+        failing_deletes = {"remaining": 0, "error": "database is locked", "sleeps": []}
+        session_execute = Session.execute
+
+        def execute_failing_deletes(s, statement, *args, **kwargs):
+            if failing_deletes["remaining"] and str(statement).startswith("DELETE"):
+                failing_deletes["remaining"] -= 1
+                raise OperationalError(str(statement), {}, sqlite3.OperationalError(failing_deletes["error"]))
+            return session_execute(s, statement, *args, **kwargs)
+
+        monkeypatch.setattr(Session, "execute", execute_failing_deletes)
+        monkeypatch.setattr(utilities.time, "sleep", failing_deletes["sleeps"].append)
+        return failing_deletes
+
+    def test_transient_error_is_retried_with_backoff(self, make_schema, sa_connection_string, failing_deletes):
+        add_rows(sa_connection_string, Author(id=1, name="A"))
+        schema = make_schema()
+
+        failing_deletes["remaining"] = 2
+        data = execute(schema, "mutation { deleteAuthor(id: 1) { deletedCount } }")
+        assert data["deleteAuthor"]["deletedCount"] == 1
+        assert failing_deletes["sleeps"] == [
+            utilities.DELETE_RETRY_INITIAL_BACKOFF_SECONDS, utilities.DELETE_RETRY_INITIAL_BACKOFF_SECONDS * 2
+        ]
+
+    def test_gives_up_after_the_last_attempt(self, make_schema, sa_connection_string, failing_deletes):
+        add_rows(sa_connection_string, Author(id=1, name="A"))
+        schema = make_schema()
+
+        failing_deletes["remaining"] = utilities.DELETE_RETRY_ATTEMPTS
+        result = schema.execute("mutation { deleteAuthor(id: 1) { deletedCount } }")
+        assert result.errors[0].message == "database is locked"
+        assert len(failing_deletes["sleeps"]) == utilities.DELETE_RETRY_ATTEMPTS - 1
+        assert author_names(schema) == ["A"]
+
+    def test_other_errors_are_not_retried(self, make_schema, sa_connection_string, failing_deletes):
+        add_rows(sa_connection_string, Author(id=1, name="A"))
+        schema = make_schema()
+
+        failing_deletes.update(remaining=1, error="disk I/O error")
+        result = schema.execute("mutation { deleteAuthor(id: 1) { deletedCount } }")
+        assert result.errors[0].message == "disk I/O error"
+        assert failing_deletes["sleeps"] == []
+
+    def test_no_retry_without_autocommit(self, make_schema, sa_connection_string, failing_deletes):
+        add_rows(sa_connection_string, Author(id=1, name="A"))
+        schema = make_schema(autocommit=False)
+
+        # the rollback took the request's earlier mutations with it, retrying would only run the DELETE
+        failing_deletes["remaining"] = 1
+        with request_db_sessions({}) as context:
+            result = schema.execute("mutation { deleteAuthor(id: 1) { deletedCount } }", context_value=context)
+        assert result.errors[0].message == "database is locked"
+        assert failing_deletes["sleeps"] == []
+
+
+def test_is_transient_db_error():
+    def operational_error(orig):
+        return OperationalError("DELETE", {}, orig)
+
+    class PostgresError(Exception):
+        def __init__(self, pgcode):
+            super().__init__(pgcode)
+            self.pgcode = pgcode
+
+    assert is_transient_db_error(operational_error(PostgresError("40001")))
+    assert is_transient_db_error(operational_error(PostgresError("40P01")))
+    assert is_transient_db_error(operational_error(Exception(1213, "Deadlock found when trying to get lock")))
+    assert is_transient_db_error(operational_error(sqlite3.OperationalError("database is locked")))
+
+    assert not is_transient_db_error(operational_error(PostgresError("57014")))
+    assert not is_transient_db_error(operational_error(sqlite3.OperationalError("no such table: authors")))
+    assert not is_transient_db_error(IntegrityError("DELETE", {}, sqlite3.IntegrityError("database is locked")))
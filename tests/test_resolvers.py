@@ -0,0 +1,84 @@
+import pathlib
+
+import pytest
+
+from sqlalchemy_graphql_schemagen.graphql import schemagen
+from sqlalchemy_graphql_schemagen.graphql.schemagen.utilities import (
+    SA_ORM_SELECT_SUPPORTED,
+    create_db_session_from_sa_connection_string,
+)
+
+from .conftest import Author, Book, Review, execute
+
+
+@pytest.fixture
+def library(sa_connection_string):
+    s = create_db_session_from_sa_connection_string(sa_connection_string)
+    for author_id in (1, 2):
+        author = Author(id=author_id, name=f"A{author_id}")
+        for book_index in (1, 2):
+            book = Book(title=f"T{author_id}{book_index}", author=author)
+            book.reviews = [Review(text=f"R{author_id}{book_index}{i}") for i in (1, 2)]
+            author.books.append(book)
+        s.add(author)
+    s.commit()
+    s.close()
+
+
+def selects(db_statements):
+    return [statement for statement in db_statements if statement.lstrip().startswith("SELECT")]
+
+
+NESTED_AUTHORS_QUERY = "{ authors { name books { title reviews { text } } } }"
+
+NESTED_AUTHORS_FRAGMENT_QUERY = """
+{ authors { name ...AuthorBooks } }
+fragment AuthorBooks on authors { books { title ... on books { reviews { text } } } }
+"""
+
+
+@pytest.mark.parametrize("request_string", [NESTED_AUTHORS_QUERY, NESTED_AUTHORS_FRAGMENT_QUERY])
+def test_nested_relationships_are_eager_loaded(make_schema, library, db_statements, request_string):
+    schema = make_schema()
+
+    data = execute(schema, request_string)
+    assert [len(author["books"]) for author in data["authors"]] == [2, 2]
+    assert data["authors"][1]["books"][0]["reviews"] == [{"text": "R211"}, {"text": "R212"}]
+
+    # authors, then their books, then the books' reviews: one SELECT per level, whatever the row count
+    assert len(selects(db_statements)) == 3
+
+
+def test_many_to_one_relationship_is_joined(make_schema, library, db_statements):
+    schema = make_schema()
+
+    data = execute(schema, "{ books { title author { name } } }")
+    assert [book["author"]["name"] for book in data["books"]] == ["A1", "A1", "A2", "A2"]
+    assert len(selects(db_statements)) == 1
+
+
+@pytest.mark.skipif(not SA_ORM_SELECT_SUPPORTED, reason="column-only rows need SQLAlchemy 1.4+")
+@pytest.mark.parametrize(
+    "request_string", ["{ authors { name } }", "{ authors { ...AuthorName } } fragment AuthorName on authors { name }"]
+)
+def test_column_only_query_selects_just_those_columns(make_schema, library, db_statements, request_string):
+    schema = make_schema()
+
+    assert execute(schema, request_string) == {"authors": [{"name": "A1"}, {"name": "A2"}]}
+    (author_select,) = selects(db_statements)
+    assert "authors.name" in author_select and "authors.id" not in author_select
+
+
+def test_query_with_relationships_loads_whole_objects(make_schema, library, db_statements):
+    schema = make_schema()
+
+    data = execute(schema, "{ authors { name books { title } } }")
+    assert data["authors"][0] == {"name": "A1", "books": [{"title": "T11"}, {"title": "T12"}]}
+    assert "authors.id" in selects(db_statements)[0]
+
+
+def test_no_forced_garbage_collection_on_the_resolver_path():
+    # objects a request loaded are freed with its session; a gc.collect() (even a commented-out one) on every
+    # resolver/mutation call only stalls the request.
+    for module_path in pathlib.Path(schemagen.__file__).parent.glob("*.py"):
+        assert "gc.collect" not in module_path.read_text(), module_path.name
@@ -0,0 +1,75 @@
+from sqlalchemy import Column, Integer, String
+from sqlalchemy.ext.declarative import declarative_base
+
+from sqlalchemy_graphql_schemagen.graphql import schemagen
+from sqlalchemy_graphql_schemagen.graphql.schemagen import SQLAlchemyGraphQLSchemaGenerator
+from sqlalchemy_graphql_schemagen.graphql.schemagen.utilities import (
+    create_db_session_from_sa_connection_string,
+    get_all_sa_model_classes,
+)
+
+from .conftest import Author, Base, Book, BookTag, Publisher, Review
+
+
+def test_models_declared_after_init_are_in_the_schema(sa_connection_string):
+    LateBase = declarative_base()
+
+    class Early(LateBase):
+        __tablename__ = "early"
+        id = Column(Integer, primary_key=True)
+
+    generator = SQLAlchemyGraphQLSchemaGenerator("Late", LateBase, sa_connection_string=sa_connection_string)
+    assert "lateArrival" not in str(generator.get_graphene_schema())
+
+    class LateArrival(LateBase):
+        __tablename__ = "late_arrival"
+        id = Column(Integer, primary_key=True)
+        name = Column(String(50))
+
+    sdl = str(generator.get_graphene_schema())
+    assert "early" in sdl
+    assert "lateArrival" in sdl
+    assert "createLatearrival" in sdl
+
+
+def test_model_classes_are_listed_in_declaration_order():
+    # (the order of the generated SDL follows it)
+    assert get_all_sa_model_classes(Base) == [Author, Book, Review, BookTag, Publisher]
+
+
+def test_compiled_executor_parses_once_and_runs_many_times(make_schema, sa_connection_string, monkeypatch):
+    s = create_db_session_from_sa_connection_string(sa_connection_string)
+    s.add_all([Author(id=1, name="A"), Author(id=2, name="B")])
+    s.commit()
+    s.close()
+
+    parsed_documents = []
+    original_parse = schemagen.parse
+
+    def recording_parse(request_string):
+        parsed_documents.append(request_string)
+        return original_parse(request_string)
+
+    monkeypatch.setattr(schemagen, "parse", recording_parse)
+
+    schema = make_schema()
+    executor = SQLAlchemyGraphQLSchemaGenerator.get_compiled_executor(
+        schema, "query ($name: String) { authors(filters: [{name: {op: EQ, v: $name}}]) { id name } }"
+    )
+
+    first_result = executor(variable_values={"name": "A"})
+    second_result = executor(variable_values={"name": "B"})
+
+    assert not first_result.errors and not second_result.errors
+    assert first_result.data == {"authors": [{"id": "1", "name": "A"}]}
+    assert second_result.data == {"authors": [{"id": "2", "name": "B"}]}
+    assert len(parsed_documents) == 1
+
+
+def test_compiled_executor_of_an_invalid_document(make_schema):
+    executor = SQLAlchemyGraphQLSchemaGenerator.get_compiled_executor(make_schema(), "{ authors { noSuchField } }")
+
+    result = executor()
+    assert result.invalid
+    assert "noSuchField" in str(result.errors[0])
+    assert executor().errors == result.errors
@@ -0,0 +1,146 @@
+import gc
+
+import pytest
+from sqlalchemy import event
+
+from sqlalchemy_graphql_schemagen.graphql.schemagen import utilities
+from sqlalchemy_graphql_schemagen.graphql.schemagen.utilities import (
+    REQUEST_CONTEXT_DB_SESSIONS_KEY,
+    close_request_db_sessions,
+    create_db_session_from_sa_connection_string,
+    get_request_db_sessions,
+    get_sessionmaker_from_sa_connection_string,
+    open_request_db_sessions,
+    request_db_sessions,
+)
+
+from .conftest import Author, Book, execute
+
+
+@pytest.fixture
+def checked_out_connections(sa_connection_string):
+    """How many of the engine's pooled connections are currently checked out."""
+    engine = get_sessionmaker_from_sa_connection_string(sa_connection_string).kw["bind"]
+    counts = {"checkout": 0, "checkin": 0}
+
+    def on_checkout(*_args):
+        counts["checkout"] += 1
+
+    def on_checkin(*_args):
+        counts["checkin"] += 1
+
+    event.listen(engine, "checkout", on_checkout)
+    event.listen(engine, "checkin", on_checkin)
+    yield lambda: counts["checkout"] - counts["checkin"]
+    event.remove(engine, "checkout", on_checkout)
+    event.remove(engine, "checkin", on_checkin)
+
+
+@pytest.fixture
+def author_with_books(sa_connection_string):
+    s = create_db_session_from_sa_connection_string(sa_connection_string)
+    s.add(Author(id=1, name="A", books=[Book(id=1, title="T1"), Book(id=2, title="T2")]))
+    s.commit()
+    s.close()
+
+
+def test_request_shares_one_session_until_closed(make_schema, sa_connection_string, author_with_books,
+                                                 checked_out_connections):
+    schema = make_schema(autocommit=False)
+
+    context = {}
+    open_request_db_sessions(context)
+    execute(schema, "{ authors { name } books { title } }", context_value=context)
+    execute(schema, 'mutation { updateAuthor(authorData: {id: 1, name: "Z"}) { Author { name } } }',
+            context_value=context)
+    assert list(context[REQUEST_CONTEXT_DB_SESSIONS_KEY]) == [sa_connection_string]
+    assert checked_out_connections() == 1
+
+    close_request_db_sessions(context)
+    assert context[REQUEST_CONTEXT_DB_SESSIONS_KEY] == {}
+    assert checked_out_connections() == 0
+
+
+def test_no_context_sessions_are_closed(make_schema, author_with_books, checked_out_connections):
+    schema = make_schema()
+
+    data = execute(schema, "{ authors { name books { title } } }")
+    assert data == {"authors": [{"name": "A", "books": [{"title": "T1"}, {"title": "T2"}]}]}
+    assert checked_out_connections() == 0
+
+    data = execute(schema, 'mutation { updateAuthor(authorData: {id: 1, name: "Z"}) { Author { name books { title } } } }')
+    assert data["updateAuthor"]["Author"] == {"name": "Z", "books": [{"title": "T1"}, {"title": "T2"}]}
+
+    data = execute(schema, 'mutation { createBook(bookData: {title: "T3", authorId: 1}) { Book { title author { name } } } }')
+    assert data["createBook"]["Book"] == {"title": "T3", "author": {"name": "Z"}}
+
+    execute(schema, "mutation { deleteBook(id: 3) { deletedCount } }")
+    assert checked_out_connections() == 0
+
+
+class ObjectContext:
+    pass
+
+
+@pytest.fixture
+def created_sessions(monkeypatch):
+    created_sessions = []
+    create_db_session = utilities.create_db_session_from_sa_connection_string
+    monkeypatch.setattr(
+        utilities, "create_db_session_from_sa_connection_string",
+        lambda cs: created_sessions.append(cs) or create_db_session(cs),
+    )
+    return created_sessions
+
+
+@pytest.fixture
+def no_gc():
+    # connections must go back to the pool when the request ends, not whenever the garbage collector runs
+    gc.disable()
+    yield
+    gc.enable()
+
+
+@pytest.mark.parametrize("context_class", [dict, ObjectContext])
+def test_context_shares_sessions_once_opened(make_schema, author_with_books, created_sessions, context_class,
+                                             checked_out_connections, no_gc):
+    schema = make_schema()
+
+    with request_db_sessions(context_class()) as context:
+        execute(schema, "{ authors { name } books { title } }", context_value=context)
+        execute(schema, 'mutation { createAuthor(authorData: {name: "B"}) { Author { id } } }', context_value=context)
+        assert len(created_sessions) == 1
+        assert checked_out_connections() == 1
+    assert checked_out_connections() == 0
+
+
+@pytest.mark.parametrize("context_class", [dict, ObjectContext])
+def test_context_without_opened_sessions(make_schema, author_with_books, created_sessions, context_class,
+                                         checked_out_connections, no_gc):
+    schema = make_schema()
+
+    # (ex.: a framework's request object, nobody would close sessions left on it): one session per resolver
+    context = context_class()
+    execute(schema, "{ authors { name } books { title } }", context_value=context)
+    assert len(created_sessions) == 2
+    assert get_request_db_sessions(context) is None
+    assert checked_out_connections() == 0
+
+
+def test_get_request_db_sessions():
+    dict_context = {}
+    assert get_request_db_sessions(dict_context) is None
+    open_request_db_sessions(dict_context)
+    assert get_request_db_sessions(dict_context) is dict_context[REQUEST_CONTEXT_DB_SESSIONS_KEY]
+
+    object_context = ObjectContext()
+    assert get_request_db_sessions(object_context) is None
+    open_request_db_sessions(object_context)
+    assert get_request_db_sessions(object_context) is getattr(object_context, REQUEST_CONTEXT_DB_SESSIONS_KEY)
+
+    # opening them again keeps the sessions already there
+    sessions = get_request_db_sessions(object_context)
+    open_request_db_sessions(object_context)
+    assert get_request_db_sessions(object_context) is sessions
+
+    assert get_request_db_sessions(None) is None